@@ -7,20 +7,46 @@ https://github.com/RowanTaubitz/brama_integration
 
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
 from homeassistant.const import CONF_IP_ADDRESS, Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
 from homeassistant.loader import async_get_loaded_integration
 
-from .api import BramaIntegrationApiClient
+from . import number, select, sensor, switch
+from .api import BramaIntegrationApiClient, BramaIntegrationApiClientError
+from .const import (
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_REQUEST_TIMEOUT,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DOMAIN,
+    LOGGER,
+    REQUEST_TIMEOUT,
+    STORAGE_VERSION,
+)
 from .coordinator import BlueprintDataUpdateCoordinator
-from .data import BramaIntegrationData
+from .data import (
+    BramaCapabilities,
+    BramaIntegrationData,
+    BramaIntegrationDomainData,
+)
+from .scheduler import BramaPollScheduler
+from .services import async_setup_services
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
-    from .data import BramaIntegrationConfigEntry
+    from .data import BramaIntegrationConfigEntry, InfoSnapshot
 
 PLATFORMS: list[Platform] = [
     Platform.NUMBER,
@@ -29,6 +55,23 @@ PLATFORMS: list[Platform] = [
     Platform.SWITCH,
 ]
 
+# Entities of each platform that read a value from the amp
+PLATFORM_DESCRIPTIONS: dict[Platform, Sequence] = {
+    Platform.NUMBER: number.ENTITY_DESCRIPTIONS,
+    Platform.SELECT: select.ENTITY_DESCRIPTIONS,
+    Platform.SENSOR: sensor.ENTITY_DESCRIPTIONS,
+    Platform.SWITCH: switch.ENTITY_DESCRIPTIONS,
+}
+
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the services shared by all entries."""
+    async_setup_services(hass)
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -36,23 +79,83 @@ async def async_setup_entry(
     entry: BramaIntegrationConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
+    domain_data: BramaIntegrationDomainData = hass.data.setdefault(
+        DOMAIN, BramaIntegrationDomainData(scheduler=BramaPollScheduler())
+    )
+    entry.async_on_unload(domain_data.scheduler.async_register(entry.entry_id))
+
+    client = BramaIntegrationApiClient(
+        ip_address=entry.data[CONF_IP_ADDRESS],
+        request_timeout=entry.options.get(CONF_REQUEST_TIMEOUT, REQUEST_TIMEOUT),
+        request_slot=domain_data.scheduler.async_request_slot,
+    )
+    min_interval, max_interval = _get_poll_intervals(entry)
     coordinator = BlueprintDataUpdateCoordinator(
         hass=hass,
+        scheduler=domain_data.scheduler,
+        store=_get_store(hass, entry.entry_id),
+        min_interval=min_interval,
+        max_interval=max_interval,
     )
+    # Set up the entities from the last known state and fetch the live state
+    # in the background, so that a slow or offline amp does not hold up startup
+    await coordinator.async_restore()
+
+    # Only set up the entities, platforms and polls the amp has use for
+    if (info := coordinator.data.get("info")) is None:
+        info = await _async_get_first_info(client, entry)
+    capabilities = BramaCapabilities.from_info(info)
+    supported = {
+        platform: [
+            description
+            for description in PLATFORM_DESCRIPTIONS[platform]
+            if capabilities.supports(description.source)
+        ]
+        for platform in PLATFORMS
+    }
+    _async_remove_unsupported_entities(hass, entry, supported)
+    coordinator.endpoints = {"status", "info"} | {
+        description.source[0]
+        for descriptions in supported.values()
+        for description in descriptions
+    }
     entry.runtime_data = BramaIntegrationData(
-        client=BramaIntegrationApiClient(
-            ip_address=entry.data[CONF_IP_ADDRESS],
-            session=async_get_clientsession(hass),
-        ),
+        client=client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        capabilities=capabilities,
+        # The sensor platform also holds the diagnostic sensors
+        platforms=[
+            platform
+            for platform in PLATFORMS
+            if supported[platform] or platform is Platform.SENSOR
+        ],
     )
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    @callback
+    def _async_check_capabilities() -> None:
+        """Reload once the live info shows other capabilities than set up."""
+        if (
+            info := coordinator.data.get("info")
+        ) is None or BramaCapabilities.from_info(info) == capabilities:
+            return
+        LOGGER.info("Capabilities of %s changed, reloading", entry.title)
+        # The live info is saved on unload, so the reload sets up for it
+        hass.config_entries.async_schedule_reload(entry.entry_id)
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            _async_check_capabilities, frozenset({("info", "payload")})
+        )
+    )
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+    )
+
+    await hass.config_entries.async_forward_entry_setups(
+        entry, entry.runtime_data.platforms
+    )
+    entry.async_on_unload(entry.add_update_listener(async_update_entry))
 
     return True
 
@@ -62,13 +165,95 @@ async def async_unload_entry(
     entry: BramaIntegrationConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, entry.runtime_data.platforms
+    ):
+        await entry.runtime_data.coordinator.async_save()
+        await entry.runtime_data.client.async_close()
+    return unload_ok
+
+
+async def _async_get_first_info(
+    client: BramaIntegrationApiClient,
+    entry: BramaIntegrationConfigEntry,
+) -> InfoSnapshot | None:
+    """Ask a new amp what it has, None if it does not answer."""
+    # Only a new entry has no stored info, and its amp was just reached
+    try:
+        return await client.async_get_info()
+    except BramaIntegrationApiClientError as exception:
+        LOGGER.debug("Error getting the info of %s - %s", entry.title, exception)
+        return None
 
 
-async def async_reload_entry(
+@callback
+def _async_remove_unsupported_entities(
     hass: HomeAssistant,
     entry: BramaIntegrationConfigEntry,
+    supported: dict[Platform, list],
 ) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """Remove the entities of values the amp turned out not to have."""
+    entity_registry = er.async_get(hass)
+    for platform, descriptions in PLATFORM_DESCRIPTIONS.items():
+        for description in descriptions:
+            if description in supported[platform]:
+                continue
+            if entity_id := entity_registry.async_get_entity_id(
+                platform, DOMAIN, f"{entry.entry_id}_{DOMAIN}_{description.key}"
+            ):
+                entity_registry.async_remove(entity_id)
+
+
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: BramaIntegrationConfigEntry,
+) -> None:
+    """Remove the stored state of a deleted entry."""
+    await _get_store(hass, entry.entry_id).async_remove()
+
+
+def _get_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the storage holding the last known state of an amp."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+async def async_update_entry(
+    hass: HomeAssistant,
+    entry: BramaIntegrationConfigEntry,
+) -> None:
+    """Apply changed options and addresses to the running entry, without a reload."""
+    client = entry.runtime_data.client
+    coordinator = entry.runtime_data.coordinator
+    client.request_timeout = entry.options.get(CONF_REQUEST_TIMEOUT, REQUEST_TIMEOUT)
+    coordinator.async_set_poll_intervals(*_get_poll_intervals(entry))
+
+    ip_address = entry.data[CONF_IP_ADDRESS]
+    if ip_address == client.ip_address:
+        return
+    LOGGER.info("Amp %s moved to %s", entry.title, ip_address)
+    client.set_ip_address(ip_address)
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(
+        identifiers={(DOMAIN, entry.entry_id)}
+    ):
+        device_registry.async_update_device(device.id, name=f"Brama ({ip_address})")
+    coordinator.async_invalidate("status", "settings", "info")
+    await coordinator.async_request_refresh()
+
+
+def _get_poll_intervals(
+    entry: BramaIntegrationConfigEntry,
+) -> tuple[timedelta, timedelta]:
+    """Return the bounds of the adaptive polling interval from the options."""
+    return (
+        timedelta(
+            seconds=entry.options.get(
+                CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL.total_seconds()
+            )
+        ),
+        timedelta(
+            seconds=entry.options.get(
+                CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL.total_seconds()
+            )
+        ),
+    )
@@ -3,13 +3,51 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import heapq
+import itertools
+import random
 import socket
-from typing import Any
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager, nullcontext
+from enum import Enum
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
 import async_timeout
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
 
-from .const import HtbMethod, MuteMethod, PowerMethod
+from .const import (
+    CIRCUIT_BACKOFF_BASE,
+    CIRCUIT_BACKOFF_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CONNECTION_LIMIT,
+    CONTROL_BATCH_WINDOW,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+    LOGGER,
+    PROBE_TIMEOUT,
+    REQUEST_TIMEOUT,
+    CircuitState,
+    HtbMethod,
+    MuteMethod,
+    PowerMethod,
+    RequestPriority,
+)
+from .data import BramaSnapshot, InfoSnapshot, SettingsSnapshot, StatusSnapshot
+from .metrics import EndpointMetrics
+from .recording import TIMEOUT_ERROR
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+    from contextlib import AbstractAsyncContextManager
+
+    from .recording import BramaRecorder
+
+
+JSON_HEADERS = {"Content-type": "application/json; charset=UTF-8"}
 
 
 class BramaIntegrationApiClientError(Exception):
@@ -27,22 +65,233 @@ def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
     response.raise_for_status()
 
 
+def _resolve(future: asyncio.Future, result: Any) -> None:
+    """Resolve a future unless its caller has already given up on it."""
+    if not future.done():
+        future.set_result(result)
+
+
+class _CircuitBreaker:
+    """
+    Circuit breaker guarding the requests to a single amp.
+
+    After a few consecutive communication errors the circuit opens and
+    requests fail immediately. Once the back-off has elapsed it is half-open
+    and lets a single request through: success closes the circuit, failure
+    opens it again with twice the back-off.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the circuit breaker."""
+        self._name = name
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._retry_at = 0.0
+        self._probing = False
+
+    def before_request(self) -> bool:
+        """
+        Raise if the circuit does not let a request through right now.
+
+        Returns True for the probe of a half-open circuit, whose caller must
+        call end_probe once the request is over, however it ended.
+        """
+        if self.state is CircuitState.CLOSED:
+            return False
+        if self.state is CircuitState.OPEN and time.monotonic() >= self._retry_at:
+            self.state = CircuitState.HALF_OPEN
+        if self.state is CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        msg = (
+            f"{self._name} is unreachable, retrying in "
+            f"{max(self._retry_at - time.monotonic(), 0):.0f}s"
+        )
+        raise BramaIntegrationApiClientCommunicationError(msg)
+
+    def record_success(self) -> None:
+        """Close the circuit after a request succeeded."""
+        if self.state is not CircuitState.CLOSED:
+            LOGGER.info("%s is reachable again", self._name)
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._probing = False
+
+    def end_probe(self) -> None:
+        """Let the next request probe again if the probe ended without a verdict."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a communication error and open the circuit if needed."""
+        self._failures += 1
+        self._probing = False
+        if (
+            self.state is CircuitState.CLOSED
+            and self._failures < CIRCUIT_FAILURE_THRESHOLD
+        ):
+            return
+        # Exponential back-off with jitter so that amps recover out of step
+        backoff = min(
+            CIRCUIT_BACKOFF_BASE * 2**self._trips, CIRCUIT_BACKOFF_MAX
+        ) * random.uniform(0.8, 1.2)  # noqa: S311
+        if self.state is CircuitState.CLOSED:
+            LOGGER.warning(
+                "%s is unreachable, backing off for %.0fs", self._name, backoff
+            )
+        self.state = CircuitState.OPEN
+        self._trips += 1
+        self._retry_at = time.monotonic() + backoff
+
+
+class _RequestQueue:
+    """
+    Queue serializing the requests to a single amp.
+
+    The amp's HTTP server copes badly with overlapping requests, so only one
+    request is sent at a time. Waiting requests take their turn by priority,
+    and in arrival order within the same priority.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the request queue."""
+        self._waiters: list[tuple[RequestPriority, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._busy = False
+
+    @property
+    def busy(self) -> bool:
+        """Return True while a request to the amp is in flight."""
+        return self._busy
+
+    @asynccontextmanager
+    async def async_turn(self, priority: RequestPriority) -> AsyncIterator[None]:
+        """Wait until no other request to the amp is in flight."""
+        if self._busy:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._order), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                # Pass the turn on if it was handed over right as we gave up
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+        self._busy = True
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        """Hand the turn to the next waiting request that is still interested."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._busy = False
+
+
 class BramaIntegrationApiClient:
     """Sample API Client."""
 
     def __init__(
         self,
         ip_address: str,
-        session: aiohttp.ClientSession,
+        session: aiohttp.ClientSession | None = None,
+        request_timeout: float = REQUEST_TIMEOUT,
+        request_slot: Callable[[], AbstractAsyncContextManager] | None = None,
     ) -> None:
-        """Sample API Client."""
+        """
+        Sample API Client.
+
+        Without a session the client opens its own keep-alive connection pool
+        to the amp, which is closed by async_close. request_timeout is the
+        default timeout in seconds of a request, it can be changed at any time.
+        request_slot returns a context manager that is held while a request is
+        on the wire, like a fleet-wide slot of the poll scheduler.
+        """
         self._ip_address = ip_address
+        self.request_timeout = request_timeout
+        self._request_slot = request_slot or nullcontext
         self._session = session
+        self._owns_session = session is None
+        # Set by async_close, after which no more requests are sent
+        self._closed = False
+        self._circuit = _CircuitBreaker(ip_address)
+        self._requests = _RequestQueue()
+        # Request counters and latencies per endpoint
+        self.metrics: defaultdict[str, EndpointMetrics] = defaultdict(EndpointMetrics)
+        # Records every request with its response while set
+        self.recorder: BramaRecorder | None = None
+        # Polls per endpoint that are still waiting for their turn
+        self._queued_polls: dict[str, asyncio.Task] = {}
+        # Digest of the last raw payload of each endpoint and its snapshot
+        self._snapshots: dict[str, tuple[bytes, BramaSnapshot]] = {}
         self._base_url = f"http://{self._ip_address}/api"
+        # Latest requested value per control key that has not been sent yet
+        self._pending_controls: dict[str, tuple[Any, asyncio.Future]] = {}
+        # Number of callers whose values are waiting in _pending_controls
+        self._pending_callers = 0
+        # Task sending the pending control values
+        self._control_writer: asyncio.Task | None = None
+
+    @property
+    def ip_address(self) -> str:
+        """Return the address requests are sent to."""
+        return self._ip_address
+
+    def set_ip_address(self, ip_address: str) -> None:
+        """Send the next requests to another address, for an amp that moved."""
+        if ip_address == self._ip_address:
+            return
+        self._ip_address = ip_address
+        self._base_url = f"http://{self._ip_address}/api"
+        # Nothing learned about the old address applies to the new one
+        self._circuit = _CircuitBreaker(ip_address)
+        self._snapshots.clear()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the session, creating the dedicated one on first use."""
+        if self._closed:
+            # A late request must not open a session that is never closed
+            msg = f"The client of {self._ip_address} is closed"
+            raise BramaIntegrationApiClientError(msg)
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=CONNECTION_LIMIT,
+                    ttl_dns_cache=DNS_CACHE_TTL,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ),
+            )
+        return self._session
 
-    async def async_get(self, endpoint: str) -> Any:
+    async def async_close(self) -> None:
+        """Fail the unsent control writes and close the dedicated session."""
+        self._closed = True
+        if self._control_writer is not None:
+            self._control_writer.cancel()
+        # A writer cancelled before it started never fails them itself
+        self._fail_controls(self._pending_controls)
+        self._pending_controls = {}
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def async_get(
+        self,
+        endpoint: str,
+        request_timeout: float | None = None,
+    ) -> Any:
         """Perform a GET request to the specified endpoint."""
-        return await self._api_wrapper(method="get", url=f"{self._base_url}/{endpoint}")
+        return await self._api_wrapper(
+            method="get",
+            url=f"{self._base_url}/{endpoint}",
+            request_timeout=request_timeout,
+        )
 
     async def async_post(self, endpoint: str, data: dict) -> Any:
         """Perform a POST request to the specified endpoint."""
@@ -50,30 +299,184 @@ class BramaIntegrationApiClient:
             method="post",
             url=f"{self._base_url}/{endpoint}",
             data=data,
-            headers={"Content-type": "application/json; charset=UTF-8"},
+            headers=JSON_HEADERS,
+            priority=RequestPriority.COMMAND,
         )
 
-    async def async_get_info(self) -> Any:
+    async def async_get_info(
+        self,
+        request_timeout: float | None = None,
+    ) -> InfoSnapshot:
         """Get general info from the API."""
-        return await self.async_get("info")
+        return await self._async_get_snapshot("info", InfoSnapshot, request_timeout)
 
-    async def async_get_settings(self) -> Any:
+    async def async_get_settings(self) -> SettingsSnapshot:
         """Get settings from the API."""
-        return await self.async_get("settings")
+        return await self._async_get_snapshot("settings", SettingsSnapshot)
 
-    async def async_get_status(self) -> Any:
+    async def async_get_status(self) -> StatusSnapshot:
         """Get status from the API."""
-        return await self.async_get("status")
+        return await self._async_get_snapshot("status", StatusSnapshot)
+
+    async def _async_get_snapshot(
+        self,
+        endpoint: str,
+        snapshot_type: type[BramaSnapshot],
+        request_timeout: float | None = None,
+    ) -> Any:
+        """
+        Get an endpoint decoded into a snapshot.
+
+        When the raw payload is byte-identical to the previous one of the
+        endpoint, the previous snapshot object is returned without decoding.
+        Concurrent calls share a single request while it waits for its turn,
+        so polls queued behind a command do not pile up.
+        """
+        if (poll := self._queued_polls.get(endpoint)) is None:
+            poll = asyncio.create_task(
+                self._async_poll_snapshot(endpoint, snapshot_type, request_timeout)
+            )
+            self._queued_polls[endpoint] = poll
+        # Callers giving up must not cancel the request for the others
+        return await asyncio.shield(poll)
+
+    async def _async_poll_snapshot(
+        self,
+        endpoint: str,
+        snapshot_type: type[BramaSnapshot],
+        request_timeout: float | None,
+    ) -> Any:
+        """Send a poll of an endpoint once it is its turn and decode it."""
+
+        def _decode(raw: bytes) -> BramaSnapshot:
+            digest = hashlib.blake2b(raw, digest_size=16).digest()
+            if (cached := self._snapshots.get(endpoint)) and cached[0] == digest:
+                return cached[1]
+            payload = json_loads(raw)
+            if not isinstance(payload, dict):
+                msg = f"Unexpected {endpoint} payload: {payload!r}"
+                raise TypeError(msg)
+            snapshot = snapshot_type.from_payload(payload)
+            self._snapshots[endpoint] = (digest, snapshot)
+            return snapshot
+
+        async with self._requests.async_turn(RequestPriority.POLL):
+            # Polls of the endpoint from now on need a request of their own
+            del self._queued_polls[endpoint]
+            return await self._async_send(
+                method="get",
+                url=f"{self._base_url}/{endpoint}",
+                request_timeout=request_timeout,
+                decode=_decode,
+            )
 
     async def async_set_control(self, key: str, value: Any) -> Any:
         """Set a control parameter via the API."""
-        return await self.async_post("control", data={"settings": {key: value}})
+        return await self.async_set_controls({key: value})
+
+    async def async_set_controls(self, settings: dict[str, Any]) -> Any:
+        """
+        Set several control parameters via the API.
+
+        Writes from concurrent callers, like the entities of a scene, that
+        arrive within a short window are merged into a single /api/control
+        request, and only one request is in flight at a time. A lone write to
+        an idle amp, like each step of a script, is sent without waiting for
+        the window. A value that is replaced by a newer one for the same key
+        before it was sent is dropped, and its caller returns None right away.
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for key, value in settings.items():
+            if (superseded := self._pending_controls.get(key)) is not None:
+                _resolve(superseded[1], None)
+            future = loop.create_future()
+            self._pending_controls[key] = (
+                value.value if isinstance(value, Enum) else value,
+                future,
+            )
+            futures.append(future)
+        self._pending_callers += 1
+        if self._control_writer is None:
+            self._control_writer = asyncio.create_task(self._async_write_controls())
+        results = await asyncio.gather(*futures)
+        return next((result for result in results if result is not None), None)
+
+    @asynccontextmanager
+    async def async_control_batch(self) -> AsyncIterator[dict[str, Any]]:
+        """
+        Collect control settings and send them as one request on exit.
+
+        async with client.async_control_batch() as batch:
+            batch["src"] = 1
+            batch["vol"] = 40
+        """
+        settings: dict[str, Any] = {}
+        yield settings
+        if settings:
+            await self.async_set_controls(settings)
+
+    def is_control_pending(self, key: str) -> bool:
+        """Return True if a newer value for the control key is waiting to be sent."""
+        return key in self._pending_controls
+
+    async def _async_write_controls(self) -> None:
+        """Send the pending control values in batches until none are left."""
+        loop = asyncio.get_running_loop()
+        pending: dict[str, tuple[Any, asyncio.Future]] = {}
+        try:
+            while self._pending_controls:
+                # Only hold a write back while others may still join it
+                window_end = loop.time() + (
+                    CONTROL_BATCH_WINDOW
+                    if self._pending_callers > 1 or self._requests.busy
+                    else 0
+                )
+                # Claim the amp before the window, so polls arriving meanwhile
+                # wait behind the command instead of going first
+                async with self._requests.async_turn(RequestPriority.COMMAND):
+                    # Give writes from other entities a chance to join this
+                    # batch, for what is left of the window after the wait
+                    if (wait := window_end - loop.time()) > 0:
+                        await asyncio.sleep(wait)
+                    pending, self._pending_controls = self._pending_controls, {}
+                    self._pending_callers = 0
+                    try:
+                        result = await self._async_send(
+                            method="post",
+                            url=f"{self._base_url}/control",
+                            data={
+                                "settings": {
+                                    key: value for key, (value, _) in pending.items()
+                                }
+                            },
+                            headers=JSON_HEADERS,
+                        )
+                    except BramaIntegrationApiClientError as exception:
+                        for _, future in pending.values():
+                            if not future.done():
+                                future.set_exception(exception)
+                    else:
+                        for _, future in pending.values():
+                            _resolve(future, result)
+        finally:
+            self._control_writer = None
+            # Nobody is left to send the values of a cancelled writer
+            self._fail_controls(pending)
+            self._fail_controls(self._pending_controls)
+            self._pending_controls = {}
+
+    def _fail_controls(self, controls: dict[str, tuple[Any, asyncio.Future]]) -> None:
+        """Fail the writes of control values that will not be sent."""
+        for key, (_, future) in controls.items():
+            if not future.done():
+                msg = f"{key} was not sent to the amp"
+                future.set_exception(BramaIntegrationApiClientError(msg))
 
     # Specific setters using the generalized method
     async def async_set_power(self, value: PowerMethod) -> Any:
         """Set power state."""
-        await self.async_post("control", {"power": value == PowerMethod.ON})
-        return await asyncio.sleep(0.005)
+        return await self.async_post("control", {"power": value == PowerMethod.ON})
 
     async def async_set_muted(self, value: MuteMethod) -> Any:
         """Set mute state."""
@@ -103,39 +506,163 @@ class BramaIntegrationApiClient:
         """Set gain level."""
         return await self.async_set_control("gain", value)
 
-    async def _api_wrapper(
+    async def async_probe(self) -> None:
+        """Check if the amp responds again with a cheap, short request."""
+        await self._api_wrapper(
+            method="get",
+            url=f"{self._base_url}/status",
+            request_timeout=PROBE_TIMEOUT,
+        )
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        """Return the state of the circuit breaker."""
+        return self._circuit.state
+
+    async def _api_wrapper(  # noqa: PLR0913
         self,
         method: str,
         url: str,
         data: dict | None = None,
         headers: dict | None = None,
+        request_timeout: float | None = None,
+        priority: RequestPriority = RequestPriority.POLL,
     ) -> Any:
-        """Get information from the API."""
+        """Get information from the API once no other request is in flight."""
+        async with self._requests.async_turn(priority):
+            return await self._async_send(
+                method=method,
+                url=url,
+                data=data,
+                headers=headers,
+                request_timeout=request_timeout,
+            )
+
+    async def _async_send(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        data: dict | None = None,
+        headers: dict | None = None,
+        request_timeout: float | None = None,
+        decode: Callable[[bytes], Any] | None = None,
+    ) -> Any:
+        """Send a request, decoding the raw body with decode if given."""
+        endpoint = url.rsplit("/", 1)[-1]
+        metrics = self.metrics[endpoint]
+        # Fail fast instead of waiting on timeouts while the amp is unreachable
+        try:
+            probe = self._circuit.before_request()
+        except BramaIntegrationApiClientError:
+            metrics.rejected += 1
+            raise
+        metrics.requests += 1
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.request(
+            # Only held once it is the request's turn, while it is on the wire
+            async with self._request_slot():
+                return await self._async_exchange(
+                    method, url, data, headers, request_timeout, decode
+                )
+        finally:
+            # A cancelled or undecidable probe must not keep the circuit shut
+            if probe:
+                self._circuit.end_probe()
+
+    async def _async_exchange(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        data: dict | None,
+        headers: dict | None,
+        request_timeout: float | None,
+        decode: Callable[[bytes], Any] | None,
+    ) -> Any:
+        """Send a request and record how it went with the metrics and circuit."""
+        endpoint = url.rsplit("/", 1)[-1]
+        metrics = self.metrics[endpoint]
+        session = self._get_session()
+        # Encoded here rather than by aiohttp, to count what goes on the wire
+        body = None if data is None else json_bytes(data)
+        if body is not None:
+            metrics.bytes_sent += len(body)
+        # The turn and the request slot were taken, so no wait in line is timed
+        start = time.monotonic()
+        response = raw = None
+        try:
+            async with async_timeout.timeout(request_timeout or self.request_timeout):
+                response = await session.request(
                     method=method,
                     url=url,
                     headers=headers,
-                    json=data,
+                    data=body,
                 )
                 _verify_response_or_raise(response)
-                return await response.json(
-                    content_type=None if method == "post" else "application/json"
-                )
+                raw = await response.read()
+                metrics.bytes_received += len(raw)
+                if decode is not None:
+                    result = decode(raw)
+                else:
+                    result = await response.json(
+                        content_type=None if method == "post" else "application/json"
+                    )
 
         except TimeoutError as exception:
+            metrics.timeouts += 1
+            self._record(start, method, endpoint, data, error=TIMEOUT_ERROR)
+            self._circuit.record_failure()
             msg = f"Timeout error fetching information - {exception}"
             raise BramaIntegrationApiClientCommunicationError(
                 msg,
             ) from exception
         except (aiohttp.ClientError, socket.gaierror) as exception:
+            metrics.errors += 1
+            self._record(
+                start,
+                method,
+                endpoint,
+                data,
+                response,
+                raw,
+                str(exception) or type(exception).__name__,
+            )
+            self._circuit.record_failure()
             msg = f"Error fetching information - {exception}"
             raise BramaIntegrationApiClientCommunicationError(
                 msg,
             ) from exception
         except Exception as exception:  # pylint: disable=broad-except
+            metrics.errors += 1
+            # The amp answered, but that says nothing about whether it is healthy
+            self._record(start, method, endpoint, data, response, raw)
             msg = f"Something really wrong happened! - {exception}"
             raise BramaIntegrationApiClientError(
                 msg,
             ) from exception
+        else:
+            metrics.last_latency = time.monotonic() - start
+            metrics.latency.record(metrics.last_latency)
+            self._circuit.record_success()
+            self._record(start, method, endpoint, data, response, raw)
+            return result
+
+    def _record(  # noqa: PLR0913
+        self,
+        start: float,
+        method: str,
+        endpoint: str,
+        data: dict | None,
+        response: aiohttp.ClientResponse | None = None,
+        raw: bytes | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Add a request and how it ended to the recording, if one is running."""
+        if self.recorder is not None:
+            self.recorder.record(
+                start,
+                method,
+                endpoint,
+                data,
+                None if response is None else response.status,
+                raw,
+                error,
+            )
@@ -2,18 +2,37 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import voluptuous as vol
 from homeassistant import config_entries, data_entry_flow
 from homeassistant.const import CONF_IP_ADDRESS
+from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import (
     BramaIntegrationApiClient,
     BramaIntegrationApiClientCommunicationError,
     BramaIntegrationApiClientError,
 )
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_DEADBAND,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_REQUEST_TIMEOUT,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DOMAIN,
+    LOGGER,
+    REQUEST_TIMEOUT,
+)
+from .discovery import async_discover_devices, unique_id_from_info
+from .sensor import ENTITY_DESCRIPTIONS as SENSOR_DESCRIPTIONS
+
+if TYPE_CHECKING:
+    from .data import InfoSnapshot
+    from .sensor import BramaIntegrationSensorEntityDescription
 
 
 class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -21,17 +40,87 @@ class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        # Unique ID and info payload of the discovered amps, keyed by IP address
+        self._discovered: dict[str, tuple[str | None, InfoSnapshot]] = {}
+
     async def async_step_user(
         self,
-        user_input: dict | None = None,
+        user_input: dict | None = None,  # noqa: ARG002
     ) -> data_entry_flow.FlowResult:
         """Handle a flow initialized by the user."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=["discovery", "manual"],
+        )
+
+    async def async_step_discovery(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Scan the local subnet for amps and let the user pick one."""
+        if user_input is not None:
+            ip_address = user_input[CONF_IP_ADDRESS]
+            await self.async_set_unique_id(self._discovered[ip_address][0])
+            self._abort_if_unique_id_configured(
+                updates={CONF_IP_ADDRESS: ip_address},
+                # The running entry follows the new address without a reload
+                reload_on_update=False,
+            )
+            return self.async_create_entry(
+                title=ip_address,
+                data={CONF_IP_ADDRESS: ip_address},
+            )
+
+        configured_ids = self._async_current_ids()
+        self._discovered = {
+            ip_address: (unique_id, info)
+            for ip_address, (unique_id, info) in (
+                await async_discover_devices(
+                    self.hass,
+                    exclude_hosts={
+                        entry.data[CONF_IP_ADDRESS]
+                        for entry in self._async_current_entries()
+                    },
+                )
+            ).items()
+            # Amps without a unique ID are only told apart by their address
+            if unique_id is None or unique_id not in configured_ids
+        }
+        if not self._discovered:
+            return self.async_abort(reason="no_devices_found")
+
+        return self.async_show_form(
+            step_id="discovery",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_IP_ADDRESS): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(
+                                    value=ip_address,
+                                    label=f"{info.get('name', 'Brama')} ({ip_address})",
+                                )
+                                for ip_address, (_, info) in sorted(
+                                    self._discovered.items()
+                                )
+                            ],
+                        ),
+                    ),
+                },
+            ),
+        )
+
+    async def async_step_manual(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Handle an amp entered by its IP address."""
         _errors = {}
         if user_input is not None:
             try:
-                await self._test_credentials(
-                    ip_address=user_input[CONF_IP_ADDRESS],
-                )
+                info = await _async_get_info(user_input[CONF_IP_ADDRESS])
             except BramaIntegrationApiClientCommunicationError as exception:
                 LOGGER.error(exception)
                 _errors["base"] = "connection"
@@ -39,13 +128,19 @@ class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 LOGGER.exception(exception)
                 _errors["base"] = "unknown"
             else:
+                if (unique_id := unique_id_from_info(info)) is not None:
+                    await self.async_set_unique_id(unique_id)
+                    self._abort_if_unique_id_configured(
+                        updates={CONF_IP_ADDRESS: user_input[CONF_IP_ADDRESS]},
+                        reload_on_update=False,
+                    )
                 return self.async_create_entry(
                     title=user_input[CONF_IP_ADDRESS],
                     data=user_input,
                 )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=vol.Schema(
                 {
                     vol.Required(
@@ -61,10 +156,148 @@ class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
-    async def _test_credentials(self, ip_address: str) -> None:
-        """Validate credentials."""
-        client = BramaIntegrationApiClient(
-            ip_address=ip_address,
-            session=async_create_clientsession(self.hass),
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow."""
+        return BramaOptionsFlow(config_entry)
+
+
+class BramaOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
+    """
+    Options flow for the polling, timeouts, sensor filters and address of an amp.
+
+    The changes are applied to the running entry without reloading it.
+    """
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Manage the options."""
+        _errors = {}
+        if user_input is not None:
+            ip_address = user_input.pop(CONF_IP_ADDRESS)
+            if user_input[CONF_MIN_POLL_INTERVAL] > user_input[CONF_MAX_POLL_INTERVAL]:
+                _errors["base"] = "poll_interval_range"
+            elif ip_address != self.config_entry.data[CONF_IP_ADDRESS]:
+                _errors = await self._async_move_to(ip_address)
+            if not _errors:
+                # Keep options that are not part of the form
+                return self.async_create_entry(data={**self.options, **user_input})
+            user_input[CONF_IP_ADDRESS] = ip_address
+
+        defaults = {
+            CONF_IP_ADDRESS: self.config_entry.data[CONF_IP_ADDRESS],
+            CONF_MIN_POLL_INTERVAL: DEFAULT_MIN_POLL_INTERVAL.total_seconds(),
+            CONF_MAX_POLL_INTERVAL: DEFAULT_MAX_POLL_INTERVAL.total_seconds(),
+            CONF_REQUEST_TIMEOUT: REQUEST_TIMEOUT,
+            **{
+                option: default
+                for description in SENSOR_DESCRIPTIONS
+                for option, default in _sensor_filter_defaults(description).items()
+            },
+            **self.options,
+            **(user_input or {}),
+        }
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_IP_ADDRESS, default=defaults[CONF_IP_ADDRESS]
+                    ): selector.TextSelector(),
+                    vol.Required(
+                        CONF_MIN_POLL_INTERVAL,
+                        default=defaults[CONF_MIN_POLL_INTERVAL],
+                    ): _seconds_selector(1, 60),
+                    vol.Required(
+                        CONF_MAX_POLL_INTERVAL,
+                        default=defaults[CONF_MAX_POLL_INTERVAL],
+                    ): _seconds_selector(5, 600),
+                    vol.Required(
+                        CONF_REQUEST_TIMEOUT, default=defaults[CONF_REQUEST_TIMEOUT]
+                    ): _seconds_selector(1, 30),
+                    **{
+                        vol.Required(option, default=defaults[option]): sel
+                        for description in SENSOR_DESCRIPTIONS
+                        for option, sel in _sensor_filter_selectors(description).items()
+                    },
+                },
+            ),
+            errors=_errors,
+        )
+
+    async def _async_move_to(self, ip_address: str) -> dict[str, str]:
+        """Check that the amp answers at a new address and store it."""
+        try:
+            info = await _async_get_info(ip_address)
+        except BramaIntegrationApiClientCommunicationError as exception:
+            LOGGER.error(exception)
+            return {"base": "connection"}
+        except BramaIntegrationApiClientError as exception:
+            LOGGER.exception(exception)
+            return {"base": "unknown"}
+        unique_id = unique_id_from_info(info)
+        if self.config_entry.unique_id not in (None, unique_id):
+            return {"base": "different_amp"}
+        self.hass.config_entries.async_update_entry(
+            self.config_entry,
+            title=ip_address,
+            data={**self.config_entry.data, CONF_IP_ADDRESS: ip_address},
         )
-        await client.async_get_info()
+        return {}
+
+
+def _sensor_filter_defaults(
+    description: BramaIntegrationSensorEntityDescription,
+) -> dict[str, float]:
+    """Return the default deadband and publish interval options of a sensor."""
+    return {
+        f"{description.key}_{CONF_DEADBAND}": description.deadband,
+        f"{description.key}_{CONF_MIN_PUBLISH_INTERVAL}": (
+            description.min_publish_interval.total_seconds()
+        ),
+    }
+
+
+def _sensor_filter_selectors(
+    description: BramaIntegrationSensorEntityDescription,
+) -> dict[str, selector.NumberSelector]:
+    """Return the selectors of the deadband and publish interval of a sensor."""
+    return {
+        f"{description.key}_{CONF_DEADBAND}": selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                max=10,
+                step=0.1,
+                unit_of_measurement=description.native_unit_of_measurement,
+                mode=selector.NumberSelectorMode.BOX,
+            ),
+        ),
+        f"{description.key}_{CONF_MIN_PUBLISH_INTERVAL}": _seconds_selector(0, 3600),
+    }
+
+
+def _seconds_selector(minimum: float, maximum: float) -> selector.NumberSelector:
+    """Return a selector for a number of seconds."""
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=minimum,
+            max=maximum,
+            step=1,
+            unit_of_measurement="s",
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    )
+
+
+async def _async_get_info(ip_address: str) -> InfoSnapshot:
+    """Validate the connection and return the info payload of the amp."""
+    client = BramaIntegrationApiClient(ip_address=ip_address)
+    try:
+        return await client.async_get_info()
+    finally:
+        await client.async_close()
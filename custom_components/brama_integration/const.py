@@ -1,12 +1,142 @@
 """Constants for brama_integration."""
 
-from enum import Enum
+from datetime import timedelta
+from enum import Enum, IntEnum
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "brama_integration"
 
+# Overall deadline in seconds for fetching every endpoint in one poll cycle,
+# raised to the request timeout when that is configured to be longer
+POLL_CYCLE_TIMEOUT = 10
+
+# Timeout in seconds of a single request, configurable per entry, and of the
+# probe of an unreachable amp
+CONF_REQUEST_TIMEOUT = "request_timeout"
+REQUEST_TIMEOUT = 10
+PROBE_TIMEOUT = 2
+
+# Subnet discovery: hosts probed at once and the timeout of each probe
+DISCOVERY_CONCURRENCY = 64
+DISCOVERY_TIMEOUT = 1
+
+# Keys of the info payload that identify an amp, in order of preference
+INFO_UNIQUE_ID_KEYS = ("mac", "serial", "serial_number")
+# Keys of the info payload describing what an amp supports: the settings it
+# has, and how many inputs. Firmware without them is assumed to have all
+# settings and five inputs.
+INFO_FEATURES_KEY = "features"
+INFO_INPUTS_KEY = "inputs"
+
+# Consecutive communication errors before the circuit breaker opens, and the
+# bounds in seconds of its exponential back-off
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_BACKOFF_BASE = 5
+CIRCUIT_BACKOFF_MAX = 300
+
+# Connection pool of each amp. The embedded server only copes with a couple of
+# simultaneous connections, which are kept open between polls.
+CONNECTION_LIMIT = 2
+KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
+
+# Control writes of concurrent callers arriving within this many seconds are
+# sent as one request
+CONTROL_BATCH_WINDOW = 0.05
+
+# Seconds to wait after a write before checking the value with the amp
+OPTIMISTIC_VERIFY_DELAY = 2
+
+# While the amp powers on or off, its status is fetched every this many
+# seconds until it reports the new state or the deadline in seconds passes
+TRANSITION_POLL_INTERVAL = 0.5
+TRANSITION_TIMEOUT = 30
+
+# Services snapshotting and restoring the settings of amps under a name
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+ATTR_NAME = "name"
+DEFAULT_PRESET_NAME = "default"
+
+# Volume ramps write at most one step per this many seconds, slower when
+# the amp takes longer to answer
+SERVICE_RAMP_VOLUME = "ramp_volume"
+ATTR_VOLUME = "volume"
+ATTR_DURATION = "duration"
+ATTR_CURVE = "curve"
+RAMP_STEP_INTERVAL = 0.1
+
+# Services recording the API traffic of amps to a file in the config
+# directory, keeping at most this many of the latest requests per amp
+SERVICE_START_RECORDING = "start_recording"
+SERVICE_STOP_RECORDING = "stop_recording"
+RECORDING_MAX_EXCHANGES = 100_000
+RECORDING_VERSION = 1
+
+# Endpoints saved to storage so that entities have their last known state
+# right at startup, and how many seconds saves are delayed to batch them
+PERSISTED_ENDPOINTS = ("info", "settings")
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+# Polling cadence per endpoint. Status is fetched on every refresh, info is
+# static and only fetched at setup and on demand, settings only change when
+# someone touches the amp.
+STATUS_POLL_INTERVAL = timedelta(seconds=5)
+SETTINGS_POLL_INTERVAL = timedelta(minutes=1)
+ENDPOINT_POLL_INTERVALS: dict[str, timedelta | None] = {
+    "status": timedelta(0),
+    "settings": SETTINGS_POLL_INTERVAL,
+    "info": None,
+}
+
+# Sensor publish filtering. A new value is only written to the state machine
+# once it moved by the deadband and the minimum interval in seconds passed.
+# Both can be overridden per sensor in the options as <key>_<option>. The
+# readings in between are kept in a ring buffer of this many samples.
+CONF_DEADBAND = "deadband"
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+SENSOR_WINDOW_SIZE = 720
+
+# Upper bounds in seconds of the request and poll latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Requests in flight at once across all amps, and the window over which the
+# fleet-wide poll throughput is measured
+FLEET_MAX_CONCURRENT_REQUESTS = 8
+FLEET_THROUGHPUT_WINDOW = timedelta(minutes=1)
+
+# Bounds for the adaptive status polling interval, configurable per entry
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+DEFAULT_MIN_POLL_INTERVAL = timedelta(seconds=1)
+DEFAULT_MAX_POLL_INTERVAL = timedelta(minutes=1)
+# Burst sampling of the output stage temperatures. The status is polled every
+# THERMAL_BURST_INTERVAL while a temperature rises faster than the slope in
+# °C per second or is above the level in °C. Bursts end once the rise is below
+# half the slope and the temperature is the hysteresis below the level. The
+# slope is estimated over the samples of the trend window.
+THERMAL_KEYS = ("temp_l", "temp_r")
+THERMAL_BURST_INTERVAL = timedelta(seconds=1)
+THERMAL_SLOPE_THRESHOLD = 0.05
+THERMAL_LEVEL_THRESHOLD = 60
+THERMAL_LEVEL_HYSTERESIS = 5
+THERMAL_TREND_WINDOW = timedelta(minutes=2)
+# EVENT_THERMAL_WARNING fires when a temperature is projected to reach the
+# limit in °C within the horizon
+THERMAL_LIMIT = 80
+THERMAL_WARNING_HORIZON = timedelta(minutes=2)
+EVENT_THERMAL_WARNING = f"{DOMAIN}_thermal_warning"
+
+# Poll at the minimum interval for this long after a command was sent
+ACTIVITY_BOOST_WINDOW = timedelta(seconds=30)
+# Start backing off once the status has not changed for this long
+IDLE_BACKOFF_AFTER = timedelta(minutes=1)
+# Changes of the mains voltage up to this many volts are noise, not activity
+AC_IDLE_TOLERANCE = 2
+
 
 class PowerMethod(Enum):
     """
@@ -48,3 +178,33 @@ class HtbMethod(Enum):
 
     ENABLED = 1
     DISABLED = 0
+
+
+class CircuitState(Enum):
+    """
+    Enum describing the state of the circuit breaker of an amp.
+
+    Attributes:
+        CLOSED: Requests are sent normally.
+        OPEN: The amp is unreachable, requests fail immediately.
+        HALF_OPEN: A single probe request is let through.
+
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class RequestPriority(IntEnum):
+    """
+    Enum ordering the requests waiting for an amp, lowest value first.
+
+    Attributes:
+        COMMAND: User initiated control writes.
+        POLL: Background polls.
+
+    """
+
+    COMMAND = 0
+    POLL = 1
@@ -2,20 +2,55 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+import time
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
+import async_timeout
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import (
     BramaIntegrationApiClientError,
 )
-from .const import DOMAIN, LOGGER
+from .const import (
+    AC_IDLE_TOLERANCE,
+    ACTIVITY_BOOST_WINDOW,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DOMAIN,
+    ENDPOINT_POLL_INTERVALS,
+    EVENT_THERMAL_WARNING,
+    IDLE_BACKOFF_AFTER,
+    LOGGER,
+    OPTIMISTIC_VERIFY_DELAY,
+    PERSISTED_ENDPOINTS,
+    POLL_CYCLE_TIMEOUT,
+    RAMP_STEP_INTERVAL,
+    STATUS_POLL_INTERVAL,
+    STORAGE_SAVE_DELAY,
+    THERMAL_BURST_INTERVAL,
+    THERMAL_KEYS,
+    TRANSITION_POLL_INTERVAL,
+    TRANSITION_TIMEOUT,
+    CircuitState,
+)
+from .data import SNAPSHOT_TYPES
+from .metrics import LatencyHistogram
+from .thermal import ThermalMonitor
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+    from datetime import datetime, timedelta
+
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
 
-    from .data import BramaIntegrationConfigEntry
+    from .data import BramaIntegrationConfigEntry, BramaSnapshot, StatusSnapshot
+    from .scheduler import BramaPollScheduler
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -27,36 +62,583 @@ class BlueprintDataUpdateCoordinator(DataUpdateCoordinator):
     def __init__(
         self,
         hass: HomeAssistant,
+        scheduler: BramaPollScheduler,
+        min_interval: timedelta = DEFAULT_MIN_POLL_INTERVAL,
+        max_interval: timedelta = DEFAULT_MAX_POLL_INTERVAL,
+        store: Store | None = None,
     ) -> None:
         """Initialize."""
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=5),
+            update_interval=STATUS_POLL_INTERVAL,
         )
+        self._scheduler = scheduler
+        # Last known state of the persisted endpoints, and what was saved last
+        self._store = store
+        self._saved: dict[str, BramaSnapshot] = {}
+        # Wall time in seconds of the last successful poll, without its stagger
+        self.last_poll_duration: float | None = None
+        self.poll_durations = LatencyHistogram()
+        self.failed_polls = 0
+        # Wall time in seconds of the last fetch of each endpoint
+        self.endpoint_timings: dict[str, float] = {}
+        # Monotonic time of the last successful fetch of each endpoint
+        self._last_fetched: dict[str, float] = {}
+        # Endpoints that must be fetched on the next refresh regardless of cadence
+        self._stale: set[str] = set(ENDPOINT_POLL_INTERVALS)
+        # Endpoints holding a value that an entity of the amp is read from
+        self.endpoints: set[str] = set(ENDPOINT_POLL_INTERVALS)
+        # Adaptive polling state
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._boost_until = 0.0
+        self._last_change = time.monotonic()
+        # Optimistically written values awaiting confirmation, per endpoint
+        self._expected: dict[str, dict[str, Any]] = {}
+        # Latest write of each (endpoint, key), so that a failed write only
+        # undoes the values no newer write has replaced
+        self._last_writes: dict[tuple[str, str], object] = {}
+        self._verify_unsubs: dict[str, CALLBACK_TYPE] = {}
+        # Tasks following values the amp takes a while to reach, per key
+        self._transitions: dict[str, asyncio.Task] = {}
+        # Ramps in progress, per key
+        self._ramps: dict[str, asyncio.Task] = {}
+        self.thermal = ThermalMonitor()
+        # Seconds the amp took to report each (key, value) after it was written
+        self.transition_times: dict[tuple[str, Any], float] = {}
+        # What the listeners were last notified about
+        self._notified_data: dict[str, BramaSnapshot] = {}
+        self._notified_success: bool | None = None
+
+    async def async_restore(self) -> None:
+        """Start from the last known state of the persisted endpoints."""
+        self.data = {}
+        if self._store is None or (stored := await self._store.async_load()) is None:
+            return
+        self.data = {
+            endpoint: SNAPSHOT_TYPES[endpoint].from_dict(values)
+            for endpoint, values in stored.items()
+            if endpoint in PERSISTED_ENDPOINTS
+        }
+        self._saved = dict(self.data)
+        LOGGER.debug("Restored %s from storage", ", ".join(self.data))
+
+    @callback
+    def _async_schedule_save(self, data: dict[str, BramaSnapshot]) -> None:
+        """Save the persisted endpoints once they changed."""
+        if self._store is None or all(
+            data.get(endpoint) == self._saved.get(endpoint)
+            for endpoint in PERSISTED_ENDPOINTS
+        ):
+            return
+        self._saved = {
+            endpoint: data[endpoint]
+            for endpoint in PERSISTED_ENDPOINTS
+            if endpoint in data
+        }
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        """Save the persisted endpoints right away, for example before a reload."""
+        if self._store is not None:
+            self._async_schedule_save(self.data)
+            await self._store.async_save(self._data_to_store())
+
+    def _data_to_store(self) -> dict[str, dict[str, Any]]:
+        """Return the persisted endpoints in their stored form."""
+        return {
+            endpoint: snapshot.as_dict() for endpoint, snapshot in self._saved.items()
+        }
+
+    @callback
+    def async_note_activity(self) -> None:
+        """Poll at the minimum interval for a while after a user command."""
+        self._boost_until = time.monotonic() + ACTIVITY_BOOST_WINDOW.total_seconds()
+        if self.update_interval != self.min_interval:
+            self.update_interval = self.min_interval
+            # Bring the pending poll forward instead of waiting out the old interval
+            if self._listeners:
+                self._schedule_refresh()
+
+    @callback
+    def async_set_poll_intervals(
+        self, min_interval: timedelta, max_interval: timedelta
+    ) -> None:
+        """Change the bounds of the adaptive polling interval in place."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        interval = max(
+            min_interval,
+            min(self.update_interval or STATUS_POLL_INTERVAL, max_interval),
+        )
+        if interval != self.update_interval:
+            LOGGER.debug("Adjusting polling interval to %s", interval)
+            self.update_interval = interval
+            # Move the pending poll to the new interval
+            if self._listeners:
+                self._schedule_refresh()
+
+    def _adapt_update_interval(self, previous: dict, data: dict) -> None:
+        """Pick the next polling interval from the power state and recent activity."""
+        now = time.monotonic()
+        status = data.get("status")
+        previous_status = previous.get("status")
+        if status is not previous_status and (
+            status is None or _is_activity(previous_status, status)
+        ):
+            self._last_change = now
+
+        if now < self._boost_until:
+            interval = self.min_interval
+        elif self.thermal.burst:
+            interval = THERMAL_BURST_INTERVAL
+        elif status is None or not status.get("amp_pwr", False):
+            interval = self.max_interval
+        elif now - self._last_change >= IDLE_BACKOFF_AFTER.total_seconds():
+            # Double the interval on every idle cycle until the maximum is reached
+            interval = (self.update_interval or STATUS_POLL_INTERVAL) * 2
+        else:
+            interval = STATUS_POLL_INTERVAL
+        interval = max(self.min_interval, min(interval, self.max_interval))
+
+        if interval != self.update_interval:
+            LOGGER.debug("Adjusting polling interval to %s", interval)
+            self.update_interval = interval
+
+    @callback
+    def _async_update_thermal(self, status: StatusSnapshot) -> None:
+        """Follow the temperature trend and warn ahead of the thermal limit."""
+        for warning in self.thermal.update(time.monotonic(), status):
+            LOGGER.warning(
+                "%s of %s is projected to reach %s °C in %ss",
+                warning["sensor"],
+                self.config_entry.title,
+                warning["limit"],
+                warning["seconds_to_limit"],
+            )
+            self.hass.bus.async_fire(
+                EVENT_THERMAL_WARNING,
+                {"entry_id": self.config_entry.entry_id, **warning},
+            )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Notify the listeners whose source keys changed since the last notification.
+
+        Entities subscribe by passing a set of (endpoint, key) tuples as their
+        coordinator context. Listeners without a context are notified of any
+        change, and everyone is notified when the availability changes.
+        """
+        data = self.data or {}
+        changed: set[tuple[str, str]] | None = None
+        if self.last_update_success == self._notified_success:
+            changed = _changed_keys(self._notified_data, data)
+            if not changed:
+                return
+        self._notified_data = data
+        self._notified_success = self.last_update_success
+
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or context is None or not changed.isdisjoint(context):
+                update_callback()
+
+    @callback
+    def _async_notify_value(self, endpoint: str, key: str) -> None:
+        """Notify the listeners of a value even though the value did not change."""
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or (endpoint, key) in context:
+                update_callback()
+
+    @callback
+    def async_invalidate(self, *endpoints: str) -> None:
+        """Mark endpoints to be fetched on the next refresh."""
+        self._stale.update(endpoints)
+
+    def _due_endpoints(self) -> list[str]:
+        """Return the endpoints that are due for a fetch in this cycle."""
+        now = time.monotonic()
+        return [
+            endpoint
+            for endpoint, interval in ENDPOINT_POLL_INTERVALS.items()
+            if endpoint in self.endpoints
+            and (
+                endpoint in self._stale
+                or (
+                    interval is not None
+                    and now - self._last_fetched[endpoint] >= interval.total_seconds()
+                )
+            )
+        ]
 
     async def _async_update_data(self) -> Any:
         """Update data via library."""
+        due = self._due_endpoints()
+        client = self.config_entry.runtime_data.client
+        await self._scheduler.async_wait_for_turn(self.config_entry.entry_id)
+        poll_start = time.monotonic()
+        # A longer request timeout in the options must not be cut short
+        cycle_timeout = max(POLL_CYCLE_TIMEOUT, client.request_timeout)
         try:
-            # Fetch data from multiple endpoints
-            status = (
-                await self.config_entry.runtime_data.client.async_get_status()
-            )  # Get status data
-            settings = (
-                await self.config_entry.runtime_data.client.async_get_settings()
-            )  # Get settings data
-            info = (
-                await self.config_entry.runtime_data.client.async_get_info()
-            )  # Get additional info data
-
-            # Combine all data into a single dictionary
-            data = {
-                "status": status,
-                "settings": settings,
-                "info": info,
-            }
+            if client.circuit_state is not CircuitState.CLOSED:
+                # Check that an unreachable amp is back before polling it fully
+                await client.async_probe()
+            # Fetch the due endpoints concurrently under a single deadline
+            async with async_timeout.timeout(cycle_timeout):
+                results = await asyncio.gather(
+                    *(self._async_fetch(endpoint) for endpoint in due)
+                )
+        except TimeoutError as exception:
+            self.failed_polls += 1
+            msg = f"Timeout fetching data after {cycle_timeout}s"
+            raise UpdateFailed(msg) from exception
         except BramaIntegrationApiClientError as exception:
+            self.failed_polls += 1
             raise UpdateFailed(exception) from exception
+
+        # Merge the fetched endpoints into the previously known data
+        previous = self.data or {}
+        data = dict(previous)
+        fetched_at = time.monotonic()
+        for endpoint, result in zip(due, results, strict=True):
+            # Keep optimistic values until their verification has run
+            expected = self._expected.get(endpoint)
+            data[endpoint] = result.replace(**expected) if expected else result
+            self._last_fetched[endpoint] = fetched_at
+        self._stale.difference_update(due)
+        if "status" in due:
+            self._async_update_thermal(data["status"])
+        self._adapt_update_interval(previous, data)
+        self._scheduler.async_record_poll()
+        self.last_poll_duration = time.monotonic() - poll_start
+        self.poll_durations.record(self.last_poll_duration)
+        self._async_schedule_save(data)
+        return data
+
+    async def _async_fetch(self, endpoint: str) -> Any:
+        """Fetch a single endpoint and record how long it took."""
+        client = self.config_entry.runtime_data.client
+        fetchers = {
+            "status": client.async_get_status,
+            "settings": client.async_get_settings,
+            "info": client.async_get_info,
+        }
+        start = time.monotonic()
+        try:
+            return await fetchers[endpoint]()
+        finally:
+            self.endpoint_timings[endpoint] = time.monotonic() - start
+            LOGGER.debug(
+                "Fetched %s in %.3fs", endpoint, self.endpoint_timings[endpoint]
+            )
+
+    async def async_write(
+        self,
+        endpoint: str,
+        key: str,
+        value: Any,
+        request: Awaitable,
+        *,
+        transition: bool = False,
+    ) -> None:
+        """
+        Apply a written value to the cached data before sending it to the amp.
+
+        The entities update right away. The endpoint holding the value is
+        fetched again a little later, and the amp's value wins if it differs.
+        With transition, for values the amp takes a while to reach like its
+        power state, the endpoint is fetched at a short interval instead until
+        the amp reports the value or the transition times out.
+        """
+        await self.async_write_values(
+            endpoint, {key: value}, request, transition=transition
+        )
+
+    async def async_write_values(
+        self,
+        endpoint: str,
+        values: dict[str, Any],
+        request: Awaitable,
+        *,
+        transition: bool = False,
+    ) -> None:
+        """Apply several values written in a single request, like async_write."""
+        try:
+            snapshot = self._get_loaded(endpoint)
+        except HomeAssistantError:
+            # Do not leave the request unawaited
+            if asyncio.iscoroutine(request):
+                request.close()
+            raise
+        # A manual change takes over from a ramp of the same value
+        for key in values:
+            self.async_cancel_ramp(key)
+        previous = {key: snapshot.get(key) for key in values}
+        write = object()
+        for key in values:
+            self._last_writes[endpoint, key] = write
+        expected = self._expected.setdefault(endpoint, {})
+        expected.update(values)
+        self._async_set_cached_values(endpoint, values)
+        self.async_note_activity()
+        try:
+            await request
+        except BramaIntegrationApiClientError as exception:
+            own = self._async_release_writes(endpoint, values, write)
+            for key in own:
+                expected.pop(key, None)
+            self._async_set_cached_values(endpoint, {key: previous[key] for key in own})
+            msg = f"Error sending {', '.join(values)} to the amp - {exception}"
+            raise HomeAssistantError(msg) from exception
+        except asyncio.CancelledError:
+            # Whether the amp took the values is unknown, so let it tell
+            for key in self._async_release_writes(endpoint, values, write):
+                expected.pop(key, None)
+            self._async_schedule_verify(endpoint)
+            raise
+        self._async_release_writes(endpoint, values, write)
+
+        if transition:
+            for key, value in values.items():
+                if (task := self._transitions.pop(key, None)) is not None:
+                    task.cancel()
+                self._transitions[key] = self.config_entry.async_create_background_task(
+                    self.hass,
+                    self._async_track_transition(endpoint, key, value),
+                    f"{DOMAIN} {key} transition",
+                )
+            return
+        self._async_schedule_verify(endpoint)
+
+    async def async_ramp(  # noqa: PLR0913
+        self,
+        endpoint: str,
+        key: str,
+        target: int,
+        duration: float,
+        curve: Callable[[float], float],
+        set_fn: Callable[[int], Awaitable],
+    ) -> None:
+        """
+        Move an integer value to a target over a duration along a curve.
+
+        Each step is sent with set_fn once the previous one was answered, at
+        most every RAMP_STEP_INTERVAL, so a slow amp gets fewer, larger steps
+        and the ramp still ends on time. The endpoint is only fetched again
+        once the ramp is over. A new ramp or a manual write of the value
+        cancels the ramp in progress.
+        """
+        start = value = self._get_loaded(endpoint).get(key)
+        if start is None:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="value_not_known",
+                translation_placeholders={"key": key, "title": self.config_entry.title},
+            )
+        self.async_cancel_ramp(key)
+        ramp = self._ramps[key] = asyncio.current_task()  # type: ignore[assignment]
+        loop = asyncio.get_running_loop()
+        began = loop.time()
+        expected = self._expected.setdefault(endpoint, {})
+        try:
+            while True:
+                progress = min((loop.time() - began) / duration, 1) if duration else 1
+                step = round(start + (target - start) * curve(progress))
+                if step != value:
+                    try:
+                        await set_fn(step)
+                    except BramaIntegrationApiClientError as exception:
+                        msg = f"Error ramping {key} to {target} - {exception}"
+                        raise HomeAssistantError(msg) from exception
+                    value = expected[key] = step
+                    self._last_writes[endpoint, key] = ramp
+                    self._async_set_cached_values(endpoint, {key: step})
+                if progress >= 1:
+                    break
+                await asyncio.sleep(RAMP_STEP_INTERVAL)
+        finally:
+            self._async_release_writes(endpoint, (key,), ramp)
+            # A ramp or write that took over verifies the value once it is done
+            if self._ramps.get(key) is ramp:
+                del self._ramps[key]
+                self._async_schedule_verify(endpoint)
+
+    @callback
+    def _async_release_writes(
+        self, endpoint: str, keys: Iterable[str], write: object
+    ) -> list[str]:
+        """Forget a finished write, returning the keys no newer write replaced."""
+        own = [key for key in keys if self._last_writes.get((endpoint, key)) is write]
+        for key in own:
+            del self._last_writes[endpoint, key]
+        return own
+
+    def _get_loaded(self, endpoint: str) -> BramaSnapshot:
+        """Return the cached snapshot of an endpoint, raise if it is not known yet."""
+        if (snapshot := (self.data or {}).get(endpoint)) is None:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="endpoint_not_loaded",
+                translation_placeholders={
+                    "endpoint": endpoint,
+                    "title": self.config_entry.title,
+                },
+            )
+        return snapshot
+
+    @callback
+    def async_cancel_ramp(self, key: str) -> None:
+        """Stop the ramp of a value that is in progress."""
+        if (task := self._ramps.pop(key, None)) is not None:
+            task.cancel()
+
+    @callback
+    def _async_schedule_verify(self, endpoint: str) -> None:
+        """Fetch an endpoint a little later to check the values written to it."""
+        if (unsub := self._verify_unsubs.pop(endpoint, None)) is not None:
+            unsub()
+        self._verify_unsubs[endpoint] = async_call_later(
+            self.hass,
+            OPTIMISTIC_VERIFY_DELAY,
+            partial(self._async_verify_endpoint, endpoint),
+        )
+
+    @callback
+    def _async_set_cached_values(self, endpoint: str, values: dict[str, Any]) -> None:
+        """Replace values in the cached data and notify the entities."""
+        self.data = {**self.data, endpoint: self.data[endpoint].replace(**values)}
+        self.async_update_listeners()
+
+    async def async_refresh_endpoint(self, endpoint: str) -> Any:
+        """Fetch a single endpoint and merge it into the cached data."""
+        result = await self._async_fetch(endpoint)
+        self._async_set_endpoint(endpoint, result)
+        return result
+
+    @callback
+    def _async_set_endpoint(self, endpoint: str, result: BramaSnapshot) -> None:
+        """Replace an endpoint in the cached data with a fresh fetch of it."""
+        self._last_fetched[endpoint] = time.monotonic()
+        self._stale.discard(endpoint)
+        # Keep optimistic values until their verification has run
+        expected = self._expected.get(endpoint)
+        self.data = {
+            **self.data,
+            endpoint: result.replace(**expected) if expected else result,
+        }
+        self.async_update_listeners()
+
+    async def _async_track_transition(
+        self, endpoint: str, key: str, value: Any
+    ) -> None:
+        """Fetch an endpoint until the amp reports a written value or time runs out."""
+        start = time.monotonic()
+        result = None
+        try:
+            while time.monotonic() - start < TRANSITION_TIMEOUT:
+                await asyncio.sleep(TRANSITION_POLL_INTERVAL)
+                try:
+                    result = await self._async_fetch(endpoint)
+                except BramaIntegrationApiClientError as exception:
+                    LOGGER.debug("Error following %s - %s", key, exception)
+                    continue
+                if result.get(key) == value:
+                    self.transition_times[key, value] = time.monotonic() - start
+                    LOGGER.debug(
+                        "Amp reported %s=%s after %.1fs",
+                        key,
+                        value,
+                        self.transition_times[key, value],
+                    )
+                    break
+            else:
+                LOGGER.debug(
+                    "Amp did not report %s=%s within %ss",
+                    key,
+                    value,
+                    TRANSITION_TIMEOUT,
+                )
+        finally:
+            # Unless a newer write of the key took over in the meantime
+            if self._transitions.get(key) is asyncio.current_task():
+                del self._transitions[key]
+                self._expected.get(endpoint, {}).pop(key, None)
+        # Whatever the amp reports last wins over the optimistic value
+        if result is None:
+            self.async_invalidate(endpoint)
+            return
+        self._async_set_endpoint(endpoint, result)
+        if result.get(key) == value:
+            # The optimistic value already showed it, only the time is new
+            self._async_notify_value(endpoint, key)
+
+    async def _async_verify_endpoint(self, endpoint: str, _now: datetime) -> None:
+        """Check optimistically written values against what the amp reports."""
+        self._verify_unsubs.pop(endpoint, None)
+        pending = self._expected.get(endpoint, {})
+        # Values still being written or followed are verified once that is over
+        expected = {
+            key: pending.pop(key)
+            for key in list(pending)
+            if (endpoint, key) not in self._last_writes and key not in self._transitions
+        }
+        try:
+            result = await self.async_refresh_endpoint(endpoint)
+        except BramaIntegrationApiClientError as exception:
+            LOGGER.debug("Error verifying %s - %s", endpoint, exception)
+            self.async_invalidate(endpoint)
+            return
+        for key, value in expected.items():
+            if result.get(key) != value:
+                LOGGER.debug(
+                    "Amp reports %s=%s instead of %s", key, result.get(key), value
+                )
+
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled verifications and shut down the coordinator."""
+        for unsub in self._verify_unsubs.values():
+            unsub()
+        self._verify_unsubs.clear()
+        for task in (*self._transitions.values(), *self._ramps.values()):
+            task.cancel()
+        self._ramps.clear()
+        await super().async_shutdown()
+
+
+def _is_activity(previous: StatusSnapshot | None, status: StatusSnapshot) -> bool:
+    """Return True if the status changed by more than sensor noise."""
+    for key in status.changed_keys(previous):
+        # Temperatures are followed by the thermal monitor instead
+        if key in THERMAL_KEYS:
+            continue
+        if (
+            key == "ac"
+            and previous is not None
+            and None not in (old := previous.get(key), new := status.get(key))
+            and abs(new - old) <= AC_IDLE_TOLERANCE
+        ):
+            continue
+        return True
+    return False
+
+
+def _changed_keys(
+    old: dict[str, BramaSnapshot],
+    new: dict[str, BramaSnapshot],
+) -> set[tuple[str, str]]:
+    """Return the (endpoint, key) pairs whose value differs between two polls."""
+    changed = set()
+    for endpoint in old.keys() | new.keys():
+        old_snapshot = old.get(endpoint)
+        new_snapshot = new.get(endpoint)
+        # Unchanged payloads decode to the very same snapshot
+        if old_snapshot is new_snapshot:
+            continue
+        if new_snapshot is None:
+            keys = old_snapshot.changed_keys(None)
         else:
-            return data
+            keys = new_snapshot.changed_keys(old_snapshot)
+        changed.update((endpoint, key) for key in keys)
+    return changed
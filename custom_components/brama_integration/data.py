@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar, Self
+
+from .const import INFO_FEATURES_KEY, INFO_INPUTS_KEY
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import Platform
     from homeassistant.loader import Integration
 
     from .api import BramaIntegrationApiClient
     from .coordinator import BlueprintDataUpdateCoordinator
+    from .scheduler import BramaPollScheduler
 
 
 type BramaIntegrationConfigEntry = ConfigEntry[BramaIntegrationData]
@@ -23,3 +29,152 @@ class BramaIntegrationData:
     client: BramaIntegrationApiClient
     coordinator: BlueprintDataUpdateCoordinator
     integration: Integration
+    capabilities: BramaCapabilities = field(
+        default_factory=lambda: BramaCapabilities.from_info(None)
+    )
+    # Platforms set up for the capabilities of the amp
+    platforms: list[Platform] = field(default_factory=list)
+
+
+@dataclass
+class BramaIntegrationDomainData:
+    """Data shared by all Brama entries, stored in hass.data[DOMAIN]."""
+
+    scheduler: BramaPollScheduler
+
+
+@dataclass(frozen=True)
+class BramaCapabilities:
+    """What an amp supports, built once from its info payload."""
+
+    # Settings keys the amp has, None if the firmware does not tell
+    settings: frozenset[str] | None
+    # Number of options per settings key, where the amp has fewer than listed
+    option_counts: dict[str, int]
+
+    @classmethod
+    def from_info(cls, info: InfoSnapshot | None) -> BramaCapabilities:
+        """Build the capabilities, assuming everything the info does not rule out."""
+        features = None if info is None else info.get(INFO_FEATURES_KEY)
+        inputs = None if info is None else info.get(INFO_INPUTS_KEY)
+        return cls(
+            settings=None if features is None else frozenset(features),
+            option_counts={} if inputs is None else {"src": int(inputs)},
+        )
+
+    def supports(self, source: tuple[str, str]) -> bool:
+        """Return True if the amp has the value an entity is read from."""
+        endpoint, key = source
+        return endpoint != "settings" or self.settings is None or key in self.settings
+
+
+class BramaSnapshot:
+    """
+    Decoded payload of an endpoint, with one slot per payload key.
+
+    Snapshots are treated as immutable, changed copies are made with replace.
+    Values listed in SCALE are divided by their factor while decoding.
+    """
+
+    __slots__: ClassVar[tuple[str, ...]] = ()
+    SCALE: ClassVar[dict[str, int]] = {}
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> Self:
+        """Decode a JSON payload, applying the unit conversions once."""
+        snapshot = cls.__new__(cls)
+        for key in cls.__slots__:
+            value = payload.get(key)
+            if value is not None and key in cls.SCALE:
+                value /= cls.SCALE[key]
+            setattr(snapshot, key, value)
+        return snapshot
+
+    @classmethod
+    def from_dict(cls, values: dict[str, Any]) -> Self:
+        """Restore a snapshot from the values returned by as_dict."""
+        snapshot = cls.__new__(cls)
+        for key in cls.__slots__:
+            setattr(snapshot, key, values.get(key))
+        return snapshot
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a payload key."""
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def replace(self, **changes: Any) -> Self:
+        """Return a copy with some values replaced."""
+        snapshot = self.__class__.__new__(self.__class__)
+        for key in self.__slots__:
+            setattr(snapshot, key, changes.get(key, getattr(self, key)))
+        return snapshot
+
+    def changed_keys(self, other: BramaSnapshot | None) -> Iterator[str]:
+        """Yield the keys whose value differs from another snapshot."""
+        for key in self.__slots__:
+            if other is None or getattr(self, key) != getattr(other, key, None):
+                yield key
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the values as a dictionary."""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if the other snapshot holds the same values."""
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+        return next(self.changed_keys(other), None) is None
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return the representation of the snapshot."""
+        return f"{self.__class__.__name__}({self.as_dict()})"
+
+
+class StatusSnapshot(BramaSnapshot):
+    """Decoded /api/status payload, temperatures in °C and AC in V."""
+
+    __slots__ = ("ac", "amp_pwr", "temp_l", "temp_r")
+    SCALE: ClassVar[dict[str, int]] = {"ac": 100, "temp_l": 100, "temp_r": 100}
+
+
+class SettingsSnapshot(BramaSnapshot):
+    """Decoded /api/settings payload."""
+
+    __slots__ = ("gain", "htb", "led_lvl", "mix", "muted", "src", "vol")
+
+
+class InfoSnapshot(BramaSnapshot):
+    """Decoded /api/info payload, whose keys differ between firmware versions."""
+
+    __slots__ = ("payload",)
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> Self:
+        """Keep the payload as it is."""
+        snapshot = cls.__new__(cls)
+        snapshot.payload = payload
+        return snapshot
+
+    @classmethod
+    def from_dict(cls, values: dict[str, Any]) -> Self:
+        """Restore a snapshot from the values returned by as_dict."""
+        return cls.from_payload(values)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a payload key."""
+        return self.payload.get(key, default)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the values as a dictionary."""
+        return dict(self.payload)
+
+
+# Snapshot type of each endpoint
+SNAPSHOT_TYPES: dict[str, type[BramaSnapshot]] = {
+    "status": StatusSnapshot,
+    "settings": SettingsSnapshot,
+    "info": InfoSnapshot,
+}
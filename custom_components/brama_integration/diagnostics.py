@@ -0,0 +1,68 @@
+"""Diagnostics support for brama_integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_IP_ADDRESS
+
+from .const import DOMAIN, INFO_UNIQUE_ID_KEYS
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import BramaIntegrationConfigEntry, BramaIntegrationDomainData
+
+TO_REDACT = {CONF_IP_ADDRESS, *INFO_UNIQUE_ID_KEYS}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: BramaIntegrationConfigEntry,
+) -> dict[str, Any]:
+    """Return the request and poll metrics of an amp with its latest data."""
+    client = entry.runtime_data.client
+    coordinator = entry.runtime_data.coordinator
+    domain_data: BramaIntegrationDomainData = hass.data[DOMAIN]
+    return {
+        "entry": async_redact_data(
+            {"data": dict(entry.data), "options": dict(entry.options)}, TO_REDACT
+        ),
+        "capabilities": {
+            "settings": None
+            if (settings := entry.runtime_data.capabilities.settings) is None
+            else sorted(settings),
+            "option_counts": entry.runtime_data.capabilities.option_counts,
+            "platforms": entry.runtime_data.platforms,
+        },
+        "client": {
+            "circuit_state": client.circuit_state.value,
+            "endpoints": {
+                endpoint: metrics.as_dict()
+                for endpoint, metrics in client.metrics.items()
+            },
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval
+            and coordinator.update_interval.total_seconds(),
+            "last_poll_duration": coordinator.last_poll_duration,
+            "poll_durations": coordinator.poll_durations.as_dict(),
+            "failed_polls": coordinator.failed_polls,
+            "endpoint_timings": coordinator.endpoint_timings,
+            "transition_times": {
+                f"{key}={value}": seconds
+                for (key, value), seconds in coordinator.transition_times.items()
+            },
+            "thermal": coordinator.thermal.as_dict(),
+        },
+        "fleet": {"polls_per_second": domain_data.scheduler.throughput},
+        "data": async_redact_data(
+            {
+                endpoint: snapshot.as_dict()
+                for endpoint, snapshot in (coordinator.data or {}).items()
+            },
+            TO_REDACT,
+        ),
+    }
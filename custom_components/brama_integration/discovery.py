@@ -0,0 +1,97 @@
+"""Subnet discovery of Brama amps."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+from typing import TYPE_CHECKING
+
+import aiohttp
+from homeassistant.components import network
+from homeassistant.helpers.device_registry import format_mac
+
+from .api import BramaIntegrationApiClient, BramaIntegrationApiClientError
+from .const import (
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_TIMEOUT,
+    INFO_UNIQUE_ID_KEYS,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import InfoSnapshot
+
+# Never scan more than a /24 around our own address
+_MAX_PREFIX_LENGTH = 24
+
+
+def unique_id_from_info(info: InfoSnapshot) -> str | None:
+    """Return the unique ID of an amp from its info payload."""
+    for key in INFO_UNIQUE_ID_KEYS:
+        if value := info.get(key):
+            return format_mac(value) if key == "mac" else str(value)
+    return None
+
+
+async def _async_get_hosts(hass: HomeAssistant) -> set[str]:
+    """Return the addresses of the local IPv4 subnets to scan."""
+    hosts: set[str] = set()
+    for adapter in await network.async_get_adapters(hass):
+        if not adapter["enabled"]:
+            continue
+        for address in adapter["ipv4"]:
+            subnet = ipaddress.ip_network(
+                f"{address['address']}/"
+                f"{max(address['network_prefix'], _MAX_PREFIX_LENGTH)}",
+                strict=False,
+            )
+            if subnet.is_loopback or subnet.is_link_local:
+                continue
+            hosts.update(
+                str(host) for host in subnet.hosts() if str(host) != address["address"]
+            )
+    return hosts
+
+
+async def async_discover_devices(
+    hass: HomeAssistant,
+    exclude_hosts: set[str] | None = None,
+) -> dict[str, tuple[str | None, InfoSnapshot]]:
+    """
+    Probe /api/info on every host of the local subnets.
+
+    Returns the unique ID and info payload of each amp that answered, keyed by
+    its IP address. The unique ID is None for firmware that reports neither a
+    MAC address nor a serial number. Hosts in exclude_hosts are not probed.
+    """
+    hosts = await _async_get_hosts(hass) - (exclude_hosts or set())
+    semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+    found: dict[str, tuple[str | None, InfoSnapshot]] = {}
+
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=DISCOVERY_CONCURRENCY),
+    ) as session:
+
+        async def _async_probe(host: str) -> None:
+            client = BramaIntegrationApiClient(ip_address=host, session=session)
+            async with semaphore:
+                try:
+                    info = await client.async_get_info(
+                        request_timeout=DISCOVERY_TIMEOUT
+                    )
+                except BramaIntegrationApiClientError:
+                    return
+            if (unique_id := unique_id_from_info(info)) is None:
+                LOGGER.debug(
+                    "Amp at %s reports no MAC address or serial number, "
+                    "it is offered without a unique ID",
+                    host,
+                )
+            found[host] = (unique_id, info)
+
+        await asyncio.gather(*(_async_probe(host) for host in hosts))
+
+    LOGGER.debug("Discovered %d amps on %d hosts", len(found), len(hosts))
+    return found
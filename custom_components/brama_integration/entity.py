@@ -2,18 +2,39 @@
 
 from __future__ import annotations
 
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .coordinator import BlueprintDataUpdateCoordinator
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
 
 class BramaIntegrationEntity(CoordinatorEntity[BlueprintDataUpdateCoordinator]):
     """BlueprintEntity class."""
 
-    def __init__(self, coordinator: BlueprintDataUpdateCoordinator) -> None:
-        """Initialize."""
-        super().__init__(coordinator)
+    def __init__(
+        self,
+        coordinator: BlueprintDataUpdateCoordinator,
+        source: tuple[str, str] | None,
+    ) -> None:
+        """
+        Initialize.
+
+        source is the (endpoint, key) pair the entity reads its state from, it
+        is only updated when that value changes. Entities without a source are
+        updated on every change.
+        """
+        super().__init__(
+            coordinator, context=None if source is None else frozenset({source})
+        )
+        if source is not None:
+            self._source_endpoint, self._source_key = source
+            self._get_source_value = attrgetter(self._source_key)
         self._attr_unique_id = coordinator.config_entry.entry_id
         self._attr_device_info = DeviceInfo(
             name=f"Brama ({coordinator.config_entry.data['ip_address']})",
@@ -26,3 +47,31 @@ class BramaIntegrationEntity(CoordinatorEntity[BlueprintDataUpdateCoordinator]):
                 ),
             },
         )
+
+    @property
+    def available(self) -> bool:
+        """Return True once the endpoint of the source has been fetched or restored."""
+        return super().available and self._source_endpoint in self.coordinator.data
+
+    @property
+    def source_value(self) -> Any:
+        """Return the raw value the entity's state is derived from."""
+        if (snapshot := self.coordinator.data.get(self._source_endpoint)) is None:
+            return None
+        return self._get_source_value(snapshot)
+
+    async def async_write_source_value(
+        self,
+        value: Any,
+        request: Awaitable,
+        *,
+        transition: bool = False,
+    ) -> None:
+        """Send a new value to the amp and apply it to the cached data right away."""
+        await self.coordinator.async_write(
+            self._source_endpoint,
+            self._source_key,
+            value,
+            request,
+            transition=transition,
+        )
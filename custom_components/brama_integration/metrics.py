@@ -0,0 +1,94 @@
+"""Request and poll metrics for brama_integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import LATENCY_BUCKETS
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations in seconds over the fixed LATENCY_BUCKETS.
+
+    Recording a sample is a bisect and three additions, cheap enough to
+    keep on for every request.
+    """
+
+    __slots__ = ("buckets", "count", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        # One bucket per upper bound, and a last one for slower samples
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a sample."""
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the samples."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bound of the bucket holding the q-quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets, strict=False):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        # Slower than the last bucket, the slowest sample bounds it
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS] + ["le_inf"]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Counters of the requests to one endpoint of an amp."""
+
+    requests: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    # Requests refused by the open circuit breaker without reaching the amp
+    rejected: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    # Seconds the last answered request was on the wire, without its wait in line
+    last_latency: float | None = None
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "last_latency": self.last_latency,
+            "latency": self.latency.as_dict(),
+        }
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.number import NumberEntity, NumberEntityDescription
 from homeassistant.const import PERCENTAGE
@@ -11,15 +12,29 @@ from .const import DOMAIN
 from .entity import BramaIntegrationEntity
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .api import BramaIntegrationApiClient
     from .coordinator import BlueprintDataUpdateCoordinator
     from .data import BramaIntegrationConfigEntry
 
+
+@dataclass(frozen=True, kw_only=True)
+class BramaIntegrationNumberEntityDescription(NumberEntityDescription):
+    """Describes a Brama number and how it is read and written."""
+
+    # Endpoint and key the value is read from
+    source: tuple[str, str]
+    # Sends a new value to the amp
+    set_fn: Callable[[BramaIntegrationApiClient, int], Coroutine[Any, Any, Any]]
+
+
 # Define the volume control entity
 ENTITY_DESCRIPTIONS = [
-    NumberEntityDescription(
+    BramaIntegrationNumberEntityDescription(
         key="volume",
         name="Volume",
         icon="mdi:volume-high",
@@ -27,6 +42,8 @@ ENTITY_DESCRIPTIONS = [
         native_max_value=100,
         native_step=1,
         native_unit_of_measurement=PERCENTAGE,
+        source=("settings", "vol"),
+        set_fn=lambda client, value: client.async_set_volume(value),
     ),
 ]
 
@@ -44,19 +61,22 @@ async def async_setup_entry(
             coordinator=coordinator, entity_description=entity_description
         )
         for entity_description in ENTITY_DESCRIPTIONS
+        if entry.runtime_data.capabilities.supports(entity_description.source)
     )
 
 
 class BramaIntegrationNumber(BramaIntegrationEntity, NumberEntity):
     """brama_integration number class."""
 
+    entity_description: BramaIntegrationNumberEntityDescription
+
     def __init__(
         self,
         coordinator: BlueprintDataUpdateCoordinator,
-        entity_description: NumberEntityDescription,
+        entity_description: BramaIntegrationNumberEntityDescription,
     ) -> None:
         """Initialize the number entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description.source)
         self.entity_description = entity_description
         self._attr_unique_id = (
             f"{coordinator.config_entry.entry_id}_{DOMAIN}_{entity_description.key}"
@@ -64,12 +84,14 @@ class BramaIntegrationNumber(BramaIntegrationEntity, NumberEntity):
 
     @property
     def native_value(self) -> float | None:
-        """Return the current volume value."""
-        return self.coordinator.data.get("settings", {}).get("vol", 0)
+        """Return the current value."""
+        return self.source_value
 
     async def async_set_native_value(self, value: float) -> None:
-        """Set the volume to the specified value."""
-        await self.coordinator.config_entry.runtime_data.client.async_set_volume(
-            int(value)
+        """Set the number to the specified value."""
+        await self.async_write_source_value(
+            int(value),
+            self.entity_description.set_fn(
+                self.coordinator.config_entry.runtime_data.client, int(value)
+            ),
         )
-        await self.coordinator.async_request_refresh()
@@ -0,0 +1,261 @@
+"""Recording of the API traffic of an amp and its replay, for offline tests."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import cycle
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from .const import RECORDING_MAX_EXCHANGES, RECORDING_VERSION
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+# Error of an exchange that was not answered in time
+TIMEOUT_ERROR = "timeout"
+
+
+@dataclass(slots=True)
+class BramaExchange:
+    """A request sent to the amp and how it was answered."""
+
+    # Seconds between the start of the recording and the request
+    offset: float
+    # Seconds until the response was read or the request failed
+    duration: float
+    method: str
+    endpoint: str
+    data: dict[str, Any] | None = None
+    # HTTP status, None if the amp did not answer
+    status: int | None = None
+    body: str | None = None
+    # TIMEOUT_ERROR or the message of a connection error
+    error: str | None = None
+
+
+@dataclass
+class BramaRecording:
+    """
+    Exchanges with an amp, stored as gzipped JSON lines.
+
+    The first line holds the version, address and start time. Every other line
+    is an exchange with short keys and rounded timings, bodies seen before are
+    stored as the index of the line that first had them.
+    """
+
+    ip_address: str
+    started: str
+    exchanges: deque[BramaExchange] = field(default_factory=deque)
+
+    def save(self, path: Path) -> None:
+        """Write the recording to a file, which does blocking I/O."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        bodies: dict[str, int] = {}
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            header = {
+                "version": RECORDING_VERSION,
+                "ip_address": self.ip_address,
+                "started": self.started,
+            }
+            file.write(json.dumps(header) + "\n")
+            for index, exchange in enumerate(self.exchanges):
+                line: dict[str, Any] = {
+                    "t": round(exchange.offset, 3),
+                    "d": round(exchange.duration, 3),
+                    "m": exchange.method,
+                    "e": exchange.endpoint,
+                    "q": exchange.data,
+                    "s": exchange.status,
+                    "b": exchange.body,
+                    "x": exchange.error,
+                }
+                if exchange.body is not None:
+                    first = bodies.setdefault(exchange.body, index)
+                    if first != index:
+                        line["b"] = first
+                line = {key: value for key, value in line.items() if value is not None}
+                file.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, path: Path) -> BramaRecording:
+        """Read a recording written by save, which does blocking I/O."""
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            if header.get("version") != RECORDING_VERSION:
+                msg = f"Unsupported recording version {header.get('version')}"
+                raise ValueError(msg)
+            recording = cls(header["ip_address"], header["started"])
+            for line in file:
+                values = json.loads(line)
+                body = values.get("b")
+                if isinstance(body, int):
+                    body = recording.exchanges[body].body
+                recording.exchanges.append(
+                    BramaExchange(
+                        offset=values.get("t", 0.0),
+                        duration=values.get("d", 0.0),
+                        method=values["m"],
+                        endpoint=values["e"],
+                        data=values.get("q"),
+                        status=values.get("s"),
+                        body=body,
+                        error=values.get("x"),
+                    )
+                )
+        return recording
+
+
+class BramaRecorder:
+    """Collects the exchanges of a client in memory, keeping the latest ones."""
+
+    def __init__(
+        self,
+        ip_address: str,
+        started: str,
+        max_exchanges: int = RECORDING_MAX_EXCHANGES,
+    ) -> None:
+        """Start a recording at the current monotonic time."""
+        self.recording = BramaRecording(
+            ip_address, started, deque(maxlen=max_exchanges)
+        )
+        self._start = time.monotonic()
+        # Payloads that did not change share one string
+        self._bodies: dict[str, str] = {}
+
+    def record(  # noqa: PLR0913
+        self,
+        start: float,
+        method: str,
+        endpoint: str,
+        data: dict[str, Any] | None,
+        status: int | None = None,
+        raw: bytes | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Add a request that was sent at a monotonic time and how it ended."""
+        body = None
+        if raw is not None:
+            body = raw.decode(errors="replace")
+            body = self._bodies.setdefault(body, body)
+        self.recording.exchanges.append(
+            BramaExchange(
+                offset=start - self._start,
+                duration=time.monotonic() - start,
+                method=method,
+                endpoint=endpoint,
+                data=data,
+                status=status,
+                body=body,
+                error=error,
+            )
+        )
+
+
+class BramaReplay:
+    """
+    Answers requests with the exchanges of a recording.
+
+    The exchanges of each method and endpoint are played back in the order they
+    were recorded, starting over after the last one, and take their recorded
+    duration divided by speed.
+    """
+
+    def __init__(self, recording: BramaRecording, speed: float = 1.0) -> None:
+        """Initialize the replay of a recording."""
+        self.speed = speed
+        exchanges: dict[tuple[str, str], list[BramaExchange]] = {}
+        for exchange in recording.exchanges:
+            exchanges.setdefault(
+                (exchange.method.lower(), exchange.endpoint), []
+            ).append(exchange)
+        self._exchanges: dict[tuple[str, str], Iterator[BramaExchange]] = {
+            key: cycle(recorded) for key, recorded in exchanges.items()
+        }
+
+    def next_exchange(self, method: str, endpoint: str) -> BramaExchange:
+        """Return the next exchange of a request, a 404 if none was recorded."""
+        if (exchanges := self._exchanges.get((method.lower(), endpoint))) is None:
+            return BramaExchange(0.0, 0.0, method, endpoint, status=404, body="")
+        return next(exchanges)
+
+    def delay(self, exchange: BramaExchange) -> float:
+        """Return how many seconds to wait before answering."""
+        return exchange.duration / self.speed
+
+    @staticmethod
+    def is_failure(exchange: BramaExchange) -> bool:
+        """Return True if the request failed before the amp answered it."""
+        return exchange.error is not None and (
+            exchange.status is None or exchange.status < 400  # noqa: PLR2004
+        )
+
+
+class BramaReplaySession:
+    """
+    Stand-in for the aiohttp session of a client that replays a recording.
+
+    Pass it as the session of BramaIntegrationApiClient to run the client and
+    the coordinator against recorded traffic without an amp or sockets.
+    """
+
+    def __init__(self, replay: BramaReplay) -> None:
+        """Initialize the session."""
+        self.replay = replay
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        **_: Any,
+    ) -> BramaReplayResponse:
+        """Answer a request like the amp did when it was recorded."""
+        exchange = self.replay.next_exchange(method, url.rsplit("/", 1)[-1])
+        await asyncio.sleep(self.replay.delay(exchange))
+        if self.replay.is_failure(exchange):
+            if exchange.error == TIMEOUT_ERROR:
+                raise TimeoutError
+            raise aiohttp.ClientConnectionError(exchange.error)
+        return BramaReplayResponse(method, url, exchange)
+
+    async def close(self) -> None:
+        """Close the session, which holds no connections."""
+
+
+class BramaReplayResponse:
+    """Recorded response with the parts of aiohttp.ClientResponse the client uses."""
+
+    def __init__(self, method: str, url: str, exchange: BramaExchange) -> None:
+        """Initialize the response."""
+        self._method = method
+        self._url = URL(url)
+        self.status = exchange.status or 200
+        self._body = (exchange.body or "").encode()
+
+    def raise_for_status(self) -> None:
+        """Raise aiohttp.ClientResponseError for an error status."""
+        if self.status >= 400:  # noqa: PLR2004
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(
+                    self._url, self._method.upper(), CIMultiDictProxy(CIMultiDict())
+                ),
+                (),
+                status=self.status,
+            )
+
+    async def read(self) -> bytes:
+        """Return the raw body."""
+        return self._body
+
+    async def json(self, content_type: str | None = None) -> Any:  # noqa: ARG002
+        """Return the decoded body."""
+        return json.loads(self._body) if self._body else None
@@ -0,0 +1,104 @@
+"""Fleet-wide poll scheduler for brama_integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+
+from .const import (
+    FLEET_MAX_CONCURRENT_REQUESTS,
+    FLEET_THROUGHPUT_WINDOW,
+    LOGGER,
+    STATUS_POLL_INTERVAL,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from datetime import timedelta
+
+    from homeassistant.core import CALLBACK_TYPE
+
+
+class BramaPollScheduler:
+    """
+    Shared scheduler for the polls of all configured amps.
+
+    Poll starts are spaced evenly over the polling interval so that amps set
+    up at the same time do not keep polling in lockstep, and the number of
+    requests in flight across all amps is capped.
+    """
+
+    def __init__(
+        self,
+        poll_interval: timedelta = STATUS_POLL_INTERVAL,
+        max_concurrent_requests: int = FLEET_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._poll_interval = poll_interval.total_seconds()
+        self._members: set[str] = set()
+        self._requests = asyncio.Semaphore(max_concurrent_requests)
+        # Start time and amp of the latest poll that was let through
+        self._last_start = 0.0
+        self._last_entry_id: str | None = None
+        self._poll_times: deque[float] = deque()
+        self._last_report = time.monotonic()
+
+    @callback
+    def async_register(self, entry_id: str) -> CALLBACK_TYPE:
+        """Add an amp to the fleet, returns a callback removing it again."""
+        self._members.add(entry_id)
+
+        @callback
+        def _unregister() -> None:
+            self._members.discard(entry_id)
+
+        return _unregister
+
+    async def async_wait_for_turn(self, entry_id: str) -> None:
+        """
+        Delay the start of a poll until its slot in the polling interval.
+
+        Polls of different amps start at least interval/N apart, while an amp
+        polling again right after itself is never held back.
+        """
+        now = time.monotonic()
+        start = now
+        if len(self._members) > 1 and entry_id != self._last_entry_id:
+            start = max(
+                now, self._last_start + self._poll_interval / len(self._members)
+            )
+        self._last_start = start
+        self._last_entry_id = entry_id
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    @asynccontextmanager
+    async def async_request_slot(self) -> AsyncIterator[None]:
+        """Hold one of the fleet-wide request slots."""
+        async with self._requests:
+            yield
+
+    @callback
+    def async_record_poll(self) -> None:
+        """Count a finished poll towards the fleet throughput."""
+        now = time.monotonic()
+        self._poll_times.append(now)
+        while self._poll_times[0] < now - FLEET_THROUGHPUT_WINDOW.total_seconds():
+            self._poll_times.popleft()
+        if now - self._last_report >= FLEET_THROUGHPUT_WINDOW.total_seconds():
+            self._last_report = now
+            LOGGER.debug(
+                "Polling %d amps at %.2f polls/s",
+                len(self._members),
+                self.throughput,
+            )
+
+    @property
+    def throughput(self) -> float:
+        """Return the polls per second across all amps over the recent window."""
+        return len(self._poll_times) / FLEET_THROUGHPUT_WINDOW.total_seconds()
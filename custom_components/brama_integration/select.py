@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
 
@@ -10,31 +11,51 @@ from .const import DOMAIN
 from .entity import BramaIntegrationEntity
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .api import BramaIntegrationApiClient
     from .coordinator import BlueprintDataUpdateCoordinator
     from .data import BramaIntegrationConfigEntry
 
+
+@dataclass(frozen=True, kw_only=True)
+class BramaIntegrationSelectEntityDescription(SelectEntityDescription):
+    """Describes a Brama selector whose value is the index of the option."""
+
+    # Endpoint and key the option index is read from
+    source: tuple[str, str]
+    # Sends a new option index to the amp
+    set_fn: Callable[[BramaIntegrationApiClient, int], Coroutine[Any, Any, Any]]
+
+
 # Define options and descriptions for selectors
 ENTITY_DESCRIPTIONS = [
-    SelectEntityDescription(
+    BramaIntegrationSelectEntityDescription(
         key="input_selector",
         name="Input Selector",
         options=["Input 1", "Input 2", "Input 3", "Input 4", "Input 5"],
         icon="mdi:audio-input-xlr",
+        source=("settings", "src"),
+        set_fn=lambda client, index: client.async_set_input(index),
     ),
-    SelectEntityDescription(
+    BramaIntegrationSelectEntityDescription(
         key="backlight_selector",
         name="Backlight LED Level",
         options=["Off", "Low", "Medium", "High"],
         icon="mdi:led-on",
+        source=("settings", "led_lvl"),
+        set_fn=lambda client, index: client.async_set_backlight(index),
     ),
-    SelectEntityDescription(
+    BramaIntegrationSelectEntityDescription(
         key="gain_selector",
         name="Gain",
         options=["Low", "Medium", "High"],
         icon="mdi:volume-high",
+        source=("settings", "gain"),
+        set_fn=lambda client, index: client.async_set_gain(index),
     ),
 ]
 
@@ -52,67 +73,46 @@ async def async_setup_entry(
             coordinator=coordinator, entity_description=entity_description
         )
         for entity_description in ENTITY_DESCRIPTIONS
+        if entry.runtime_data.capabilities.supports(entity_description.source)
     )
 
 
 class BramaIntegrationSelect(BramaIntegrationEntity, SelectEntity):
     """brama_integration select class."""
 
+    entity_description: BramaIntegrationSelectEntityDescription
+
     def __init__(
         self,
         coordinator: BlueprintDataUpdateCoordinator,
-        entity_description: SelectEntityDescription,
+        entity_description: BramaIntegrationSelectEntityDescription,
     ) -> None:
         """Initialize the select entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description.source)
         self.entity_description = entity_description
         self._attr_unique_id = (
             f"{coordinator.config_entry.entry_id}_{DOMAIN}_{entity_description.key}"
         )
+        # Leave out the options beyond what the amp has, like missing inputs
+        option_counts = coordinator.config_entry.runtime_data.capabilities.option_counts
+        self._attr_options = list(entity_description.options or [])[
+            : option_counts.get(entity_description.source[1])
+        ]
 
     @property
     def current_option(self) -> str | None:
         """Return the current option for this selector."""
-        if self.entity_description.key == "input_selector":
-            input_index = self.coordinator.data.get("settings", {}).get("src", 0)
-            return f"Input {input_index + 1}"
-        if self.entity_description.key == "backlight_selector":
-            level = self.coordinator.data.get("settings", {}).get("led_lvl", 0)
-            if level is not None:
-                return self.entity_description.options[level]  # type: ignore[index]
+        index = self.source_value
+        if index is None or not 0 <= index < len(self._attr_options):
             return None
-        if self.entity_description.key == "gain_selector":
-            gain = self.coordinator.data.get("settings", {}).get("gain", 0)
-            if gain is not None:
-                return self.entity_description.options[gain]  # type: ignore[index]
-        return None
+        return self._attr_options[index]
 
     async def async_select_option(self, option: str) -> None:
         """Set the selected option."""
-        if self.entity_description.key == "input_selector":
-            if self.entity_description.options is not None:
-                input_index = self.entity_description.options.index(option)
-            else:
-                input_index = 0
-            await self.coordinator.config_entry.runtime_data.client.async_set_input(
-                input_index
-            )
-            await self.coordinator.async_request_refresh()
-
-        elif self.entity_description.key == "backlight_selector":
-            if self.entity_description.options is not None:
-                level = self.entity_description.options.index(option)
-            else:
-                level = 0
-            await self.coordinator.config_entry.runtime_data.client.async_set_backlight(
-                level
-            )
-            await self.coordinator.async_request_refresh()
-
-        elif self.entity_description.key == "gain_selector":
-            if self.entity_description.options is not None:
-                gain = self.entity_description.options.index(option)
-            else:
-                gain = 0
-            await self.coordinator.config_entry.runtime_data.client.async_set_gain(gain)
-            await self.coordinator.async_request_refresh()
+        index = self._attr_options.index(option)
+        await self.async_write_source_value(
+            index,
+            self.entity_description.set_fn(
+                self.coordinator.config_entry.runtime_data.client, index
+            ),
+        )
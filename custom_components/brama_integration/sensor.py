@@ -2,40 +2,198 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-from homeassistant.const import UnitOfElectricPotential, UnitOfTemperature
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfElectricPotential,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 
-from .const import DOMAIN
+from .const import (
+    CONF_DEADBAND,
+    CONF_MIN_PUBLISH_INTERVAL,
+    DOMAIN,
+    SENSOR_WINDOW_SIZE,
+)
 from .entity import BramaIntegrationEntity
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import StateType
 
     from .coordinator import BlueprintDataUpdateCoordinator
     from .data import BramaIntegrationConfigEntry
 
+
+@dataclass(frozen=True, kw_only=True)
+class BramaIntegrationSensorEntityDescription(SensorEntityDescription):
+    """Describes a Brama sensor and where its value comes from."""
+
+    # Endpoint and key the value is read from
+    source: tuple[str, str]
+    # Smallest change that is published, and the least time between publishes
+    deadband: float = 0
+    min_publish_interval: timedelta = timedelta(0)
+
+
+@dataclass(frozen=True, kw_only=True)
+class BramaIntegrationDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor exposing the request and poll metrics of an amp."""
+
+    # Reads the value from the coordinator and client metrics
+    value_fn: Callable[[BlueprintDataUpdateCoordinator], StateType]
+    attributes_fn: Callable[[BlueprintDataUpdateCoordinator], dict[str, Any]] = (
+        lambda _: {}
+    )
+
+
+# The diagnostic sensors hold no I/O, they are refreshed from memory
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+def _total(coordinator: BlueprintDataUpdateCoordinator, counter: str) -> int:
+    """Return the sum of a request counter over all endpoints."""
+    return sum(
+        getattr(metrics, counter)
+        for metrics in coordinator.config_entry.runtime_data.client.metrics.values()
+    )
+
+
+def _last_latency(
+    coordinator: BlueprintDataUpdateCoordinator, endpoint: str
+) -> float | None:
+    """Return how long the amp took to answer the last request to an endpoint."""
+    metrics = coordinator.config_entry.runtime_data.client.metrics.get(endpoint)
+    return None if metrics is None else metrics.last_latency
+
+
+def _latency_attributes(
+    coordinator: BlueprintDataUpdateCoordinator, endpoint: str
+) -> dict[str, Any]:
+    """Return the latency histogram of an endpoint as state attributes."""
+    metrics = coordinator.config_entry.runtime_data.client.metrics.get(endpoint)
+    return {} if metrics is None else metrics.latency.as_dict()
+
+
 # Define sensor descriptions
 ENTITY_DESCRIPTIONS = (
-    SensorEntityDescription(
+    BramaIntegrationSensorEntityDescription(
         key="ac_voltage",
         name="AC Voltage",
         icon="mdi:flash",
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        source=("status", "ac"),
+        deadband=1,
+        min_publish_interval=timedelta(minutes=1),
     ),
-    SensorEntityDescription(
+    BramaIntegrationSensorEntityDescription(
         key="temp_l",
         name="PA Left",
         icon="mdi:thermometer",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        source=("status", "temp_l"),
+        deadband=0.5,
+        min_publish_interval=timedelta(minutes=1),
     ),
-    SensorEntityDescription(
+    BramaIntegrationSensorEntityDescription(
         key="temp_r",
         name="PA Right",
         icon="mdi:thermometer",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        source=("status", "temp_r"),
+        deadband=0.5,
+        min_publish_interval=timedelta(minutes=1),
+    ),
+)
+
+
+DIAGNOSTIC_DESCRIPTIONS = (
+    BramaIntegrationDiagnosticSensorEntityDescription(
+        key="poll_duration",
+        name="Poll duration",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda coordinator: coordinator.last_poll_duration,
+        attributes_fn=lambda coordinator: {
+            **coordinator.poll_durations.as_dict(),
+            "failed_polls": coordinator.failed_polls,
+        },
+    ),
+    BramaIntegrationDiagnosticSensorEntityDescription(
+        key="status_latency",
+        name="Status latency",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda coordinator: _last_latency(coordinator, "status"),
+        attributes_fn=lambda coordinator: _latency_attributes(coordinator, "status"),
+    ),
+    BramaIntegrationDiagnosticSensorEntityDescription(
+        key="settings_latency",
+        name="Settings latency",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda coordinator: _last_latency(coordinator, "settings"),
+        attributes_fn=lambda coordinator: _latency_attributes(coordinator, "settings"),
+    ),
+    BramaIntegrationDiagnosticSensorEntityDescription(
+        key="request_timeouts",
+        name="Request timeouts",
+        icon="mdi:timer-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: _total(coordinator, "timeouts"),
+    ),
+    BramaIntegrationDiagnosticSensorEntityDescription(
+        key="request_errors",
+        name="Request errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: _total(coordinator, "errors"),
+    ),
+    BramaIntegrationDiagnosticSensorEntityDescription(
+        key="bytes_sent",
+        name="Bytes sent",
+        icon="mdi:upload-network-outline",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: _total(coordinator, "bytes_sent"),
+    ),
+    BramaIntegrationDiagnosticSensorEntityDescription(
+        key="bytes_received",
+        name="Bytes received",
+        icon="mdi:download-network-outline",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: _total(coordinator, "bytes_received"),
     ),
 )
 
@@ -52,35 +210,164 @@ async def async_setup_entry(
             entity_description=entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
+        if entry.runtime_data.capabilities.supports(entity_description.source)
+    )
+    async_add_entities(
+        BramaIntegrationDiagnosticSensor(
+            coordinator=entry.runtime_data.coordinator,
+            entity_description=entity_description,
+        )
+        for entity_description in DIAGNOSTIC_DESCRIPTIONS
     )
 
 
 class BramaIntegrationSensor(BramaIntegrationEntity, SensorEntity):
     """brama_integration Sensor class."""
 
+    entity_description: BramaIntegrationSensorEntityDescription
+
     def __init__(
         self,
         coordinator: BlueprintDataUpdateCoordinator,
-        entity_description: SensorEntityDescription,
+        entity_description: BramaIntegrationSensorEntityDescription,
     ) -> None:
         """Initialize the sensor class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description.source)
         self.entity_description = entity_description
         self._attr_unique_id = (
             f"{coordinator.config_entry.entry_id}_{DOMAIN}_{entity_description.key}"
         )
 
+        # Readings since the last publish
+        self._samples: deque[float] = deque(maxlen=SENSOR_WINDOW_SIZE)
+        self._published_at = 0.0
+        self._published_available: bool | None = None
+        # Publishes a change that came in before the minimum interval passed
+        self._unsub_deferred: CALLBACK_TYPE | None = None
+
     @property
-    def native_value(self) -> float | int | str | None:
+    def _deadband(self) -> float:
+        """Return the smallest change that is published, changed options apply."""
+        return self.coordinator.config_entry.options.get(
+            f"{self.entity_description.key}_{CONF_DEADBAND}",
+            self.entity_description.deadband,
+        )
+
+    @property
+    def _min_publish_interval(self) -> float:
+        """Return the least seconds between publishes, changed options apply."""
+        return self.coordinator.config_entry.options.get(
+            f"{self.entity_description.key}_{CONF_MIN_PUBLISH_INTERVAL}",
+            self.entity_description.min_publish_interval.total_seconds(),
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Publish the current value when the sensor is added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_deferred)
+        self._publish(self.source_value)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the value moved enough or availability changed."""
+        # The status snapshot already holds the values in V and °C
+        value = self.source_value
+        if value is not None:
+            self._samples.append(value)
+        self._async_publish_if_due(value)
+
+    @callback
+    def _async_publish_if_due(self, value: float | None) -> None:
+        """Write the state if a reading passes the deadband and publish interval."""
+        published = self._attr_native_value
+        if self.available == self._published_available:
+            if value is None or published is None:
+                if value == published:
+                    return
+            elif abs(value - published) < self._deadband:  # type: ignore[operator]
+                return
+            elif (
+                wait := self._published_at
+                + self._min_publish_interval
+                - time.monotonic()
+            ) > 0:
+                # The value still passes when the interval is over, unless a
+                # later reading falls back within the deadband
+                if self._unsub_deferred is None:
+                    self._unsub_deferred = async_call_later(
+                        self.hass, wait, self._async_publish_deferred
+                    )
+                return
+        self._async_cancel_deferred()
+        self._publish(value)
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_publish_deferred(self, _now: datetime) -> None:
+        """Check a change held back by the minimum publish interval again."""
+        self._unsub_deferred = None
+        self._async_publish_if_due(self.source_value)
+
+    @callback
+    def _async_cancel_deferred(self) -> None:
+        """Cancel a scheduled check of a held back change."""
+        if self._unsub_deferred is not None:
+            self._unsub_deferred()
+            self._unsub_deferred = None
+
+    def _publish(self, value: float | None) -> None:
+        """Make a reading the state, summarizing the readings since the last one."""
+        self._attr_native_value = value
+        self._published_at = time.monotonic()
+        self._published_available = self.available
+        if self._samples:
+            self._attr_extra_state_attributes = {
+                "min": min(self._samples),
+                "max": max(self._samples),
+                "mean": round(sum(self._samples) / len(self._samples), 2),
+                "samples": len(self._samples),
+            }
+            self._samples.clear()
+
+
+class BramaIntegrationDiagnosticSensor(BramaIntegrationEntity, SensorEntity):
+    """Sensor exposing a request or poll metric, disabled by default."""
+
+    entity_description: BramaIntegrationDiagnosticSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: BlueprintDataUpdateCoordinator,
+        entity_description: BramaIntegrationDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, None)
+        self.entity_description = entity_description
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_{DOMAIN}_{entity_description.key}"
+        )
+
+    @property
+    def should_poll(self) -> bool:
+        """Refresh the metrics periodically, they change without new data."""
+        return True
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the amp is unreachable, errors are counted then."""
+        return True
+
+    async def async_update(self) -> None:
+        """Read the metrics from memory instead of refreshing the coordinator."""
+
+    @property
+    def native_value(self) -> StateType:
         """Return the native value of the sensor."""
-        key = self.entity_description.key
-        status = self.coordinator.data["status"]
-
-        # Convert values if necessary (e.g., divide temperatures by 100)
-        if key == "temp_l":
-            return status.get(key, 0) / 100  # Convert from 1/100 °C to °C
-        if key == "temp_r":
-            return status.get(key, 0) / 100  # Convert from 1/100 °C to °C
-        if key == "ac_voltage":
-            return status.get("ac", 0) / 100  # Convert from 1/100 V to V
-        return None
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the details of the metric."""
+        return self.entity_description.attributes_fn(self.coordinator)
@@ -0,0 +1,270 @@
+"""Services for brama_integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID, ATTR_ENTITY_ID
+from homeassistant.core import SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_config_entry_ids
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CURVE,
+    ATTR_DURATION,
+    ATTR_NAME,
+    ATTR_VOLUME,
+    DEFAULT_PRESET_NAME,
+    DOMAIN,
+    LOGGER,
+    SERVICE_RAMP_VOLUME,
+    SERVICE_RESTORE,
+    SERVICE_SNAPSHOT,
+    SERVICE_START_RECORDING,
+    SERVICE_STOP_RECORDING,
+    STORAGE_VERSION,
+)
+from .recording import BramaRecorder
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .data import BramaIntegrationConfigEntry
+
+PRESET_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_NAME, default=DEFAULT_PRESET_NAME): cv.string,
+        **cv.TARGET_SERVICE_FIELDS,
+    }
+)
+
+# Share of the ramp covered at a share of its duration
+RAMP_CURVES = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: t * (2 - t),
+    "ease_in_out": lambda t: t * t * (3 - 2 * t),
+}
+
+RECORDING_SCHEMA = vol.Schema(cv.TARGET_SERVICE_FIELDS)
+
+RAMP_VOLUME_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_VOLUME): vol.All(vol.Coerce(int), vol.Range(0, 100)),
+        vol.Optional(
+            ATTR_DURATION, default=timedelta(seconds=5)
+        ): cv.positive_time_period,
+        vol.Optional(ATTR_CURVE, default="linear"): vol.In(RAMP_CURVES),
+        **cv.TARGET_SERVICE_FIELDS,
+    }
+)
+
+
+class BramaPresets:
+    """Named settings snapshots of the amps, kept in storage."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the presets."""
+        self._store: Store[dict[str, dict[str, dict[str, Any]]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.presets"
+        )
+        self._presets: dict[str, dict[str, dict[str, Any]]] | None = None
+
+    async def async_get(self, name: str) -> dict[str, dict[str, Any]] | None:
+        """Return the settings per entry ID saved under a name."""
+        return (await self._async_load()).get(name)
+
+    async def async_update(
+        self, name: str, settings: dict[str, dict[str, Any]]
+    ) -> None:
+        """Save the settings of some amps under a name, keeping the other amps."""
+        presets = await self._async_load()
+        presets[name] = {**presets.get(name, {}), **settings}
+        await self._store.async_save(presets)
+
+    async def _async_load(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Load the presets from storage on first use."""
+        if self._presets is None:
+            self._presets = await self._store.async_load() or {}
+        return self._presets
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    presets = BramaPresets(hass)
+
+    async def _async_snapshot(call: ServiceCall) -> ServiceResponse:
+        """Save the current settings of the target amps under a name."""
+        settings = {
+            entry.entry_id: _writable_settings(entry)
+            for entry in await _async_get_entries(hass, call)
+            if "settings" in entry.runtime_data.coordinator.data
+        }
+        await presets.async_update(call.data[ATTR_NAME], settings)
+        return settings
+
+    async def _async_restore(call: ServiceCall) -> None:
+        """Bring the target amps back to the settings saved under a name."""
+        name = call.data[ATTR_NAME]
+        if (preset := await presets.async_get(name)) is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="snapshot_not_found",
+                translation_placeholders={"name": name},
+            )
+        await asyncio.gather(
+            *(
+                _async_restore_entry(entry, preset[entry.entry_id])
+                for entry in await _async_get_entries(hass, call)
+                if entry.entry_id in preset
+            )
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT,
+        _async_snapshot,
+        schema=PRESET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RESTORE, _async_restore, schema=PRESET_SCHEMA
+    )
+
+    async def _async_ramp_volume(call: ServiceCall) -> None:
+        """Fade the volume of the target amps to a level."""
+        await asyncio.gather(
+            *(
+                _async_ramp_entry_volume(hass, entry, call)
+                for entry in await _async_get_entries(hass, call)
+                if entry.runtime_data.capabilities.supports(("settings", "vol"))
+            )
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_RAMP_VOLUME, _async_ramp_volume, schema=RAMP_VOLUME_SCHEMA
+    )
+
+    async def _async_start_recording(call: ServiceCall) -> None:
+        """Start recording the API traffic of the target amps."""
+        for entry in await _async_get_entries(hass, call):
+            client = entry.runtime_data.client
+            client.recorder = BramaRecorder(
+                client.ip_address, dt_util.utcnow().isoformat()
+            )
+
+    async def _async_stop_recording(call: ServiceCall) -> ServiceResponse:
+        """Stop the recordings of the target amps and save them to files."""
+        paths = {}
+        for entry in await _async_get_entries(hass, call):
+            client = entry.runtime_data.client
+            if (recorder := client.recorder) is None:
+                continue
+            client.recorder = None
+            path = Path(
+                hass.config.path(
+                    DOMAIN,
+                    f"{entry.entry_id}_{dt_util.utcnow():%Y%m%d_%H%M%S}.jsonl.gz",
+                )
+            )
+            await hass.async_add_executor_job(recorder.recording.save, path)
+            LOGGER.info("Saved the API traffic of %s to %s", entry.title, path)
+            paths[entry.entry_id] = str(path)
+        return paths
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        _async_start_recording,
+        schema=RECORDING_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_RECORDING,
+        _async_stop_recording,
+        schema=RECORDING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def _async_get_entries(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[BramaIntegrationConfigEntry]:
+    """Return the loaded entries of the targeted amps, all of them without target."""
+    entries = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+    if not any(
+        key in call.data for key in (ATTR_AREA_ID, ATTR_DEVICE_ID, ATTR_ENTITY_ID)
+    ):
+        return entries
+    entry_ids = await async_extract_config_entry_ids(hass, call)
+    return [entry for entry in entries if entry.entry_id in entry_ids]
+
+
+def _writable_settings(entry: BramaIntegrationConfigEntry) -> dict[str, Any]:
+    """Return the cached settings of an amp that it supports writing."""
+    capabilities = entry.runtime_data.capabilities
+    return {
+        key: value
+        for key, value in entry.runtime_data.coordinator.data["settings"]
+        .as_dict()
+        .items()
+        if value is not None and capabilities.supports(("settings", key))
+    }
+
+
+async def _async_restore_entry(
+    entry: BramaIntegrationConfigEntry, values: dict[str, Any]
+) -> None:
+    """Send the saved settings that differ from the cached ones in one request."""
+    coordinator = entry.runtime_data.coordinator
+    if (settings := coordinator.data.get("settings")) is None:
+        LOGGER.warning("Settings of %s are not known yet, not restoring", entry.title)
+        return
+    capabilities = entry.runtime_data.capabilities
+    changes = {
+        key: value
+        for key, value in values.items()
+        if settings.get(key) != value and capabilities.supports(("settings", key))
+    }
+    if not changes:
+        return
+    LOGGER.debug("Restoring %s on %s", changes, entry.title)
+    await coordinator.async_write_values(
+        "settings", changes, entry.runtime_data.client.async_set_controls(changes)
+    )
+
+
+async def _async_ramp_entry_volume(
+    hass: HomeAssistant, entry: BramaIntegrationConfigEntry, call: ServiceCall
+) -> None:
+    """Ramp the volume of one amp and wait until it is done or taken over."""
+    client = entry.runtime_data.client
+    ramp = entry.async_create_background_task(
+        hass,
+        entry.runtime_data.coordinator.async_ramp(
+            "settings",
+            "vol",
+            call.data[ATTR_VOLUME],
+            call.data[ATTR_DURATION].total_seconds(),
+            RAMP_CURVES[call.data[ATTR_CURVE]],
+            client.async_set_volume,
+        ),
+        f"{DOMAIN} volume ramp",
+    )
+    # A ramp cancelled by a newer ramp or a manual change is not an error
+    await asyncio.wait({ramp})
+    if not ramp.cancelled() and (exception := ramp.exception()) is not None:
+        raise exception
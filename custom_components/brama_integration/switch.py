@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
@@ -10,32 +11,67 @@ from .const import DOMAIN, HtbMethod, MuteMethod, PowerMethod
 from .entity import BramaIntegrationEntity
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .api import BramaIntegrationApiClient
     from .coordinator import BlueprintDataUpdateCoordinator
     from .data import BramaIntegrationConfigEntry
 
+
+@dataclass(frozen=True, kw_only=True)
+class BramaIntegrationSwitchEntityDescription(SwitchEntityDescription):
+    """Describes a Brama switch and how it is read and written."""
+
+    # Endpoint and key the state is read from
+    source: tuple[str, str]
+    # Sends the new state to the amp
+    set_fn: Callable[[BramaIntegrationApiClient, bool], Coroutine[Any, Any, Any]]
+    # Converts the new state to the raw value the amp reports for it
+    raw_value_fn: Callable[[bool], Any] = bool
+    # The amp takes a while to reach the new state, the time it took for the
+    # on state is exposed as the warm_up_time attribute
+    transition: bool = False
+
+
 ENTITY_DESCRIPTIONS = (
-    SwitchEntityDescription(
+    BramaIntegrationSwitchEntityDescription(
         key="power",
         name="Power",
         icon="mdi:power",
+        source=("status", "amp_pwr"),
+        set_fn=lambda client, on: client.async_set_power(
+            PowerMethod.ON if on else PowerMethod.OFF
+        ),
+        transition=True,
     ),
-    SwitchEntityDescription(
+    BramaIntegrationSwitchEntityDescription(
         key="mute",
         name="Mute",
         icon="mdi:volume-off",
+        source=("settings", "muted"),
+        set_fn=lambda client, on: client.async_set_muted(
+            MuteMethod.MUTED if on else MuteMethod.UNMUTED
+        ),
     ),
-    SwitchEntityDescription(
+    BramaIntegrationSwitchEntityDescription(
         key="htb",
         name="Home Theater Bypass",
         icon="mdi:theater",
+        source=("settings", "htb"),
+        set_fn=lambda client, on: client.async_set_htb(
+            HtbMethod.ENABLED if on else HtbMethod.DISABLED
+        ),
     ),
-    SwitchEntityDescription(
+    BramaIntegrationSwitchEntityDescription(
         key="triode",
         name="Triode",
         icon="mdi:transistor",
+        source=("settings", "mix"),
+        set_fn=lambda client, on: client.async_set_triode(int(on)),
+        raw_value_fn=int,
     ),
 )
 
@@ -52,69 +88,59 @@ async def async_setup_entry(
             entity_description=entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
+        if entry.runtime_data.capabilities.supports(entity_description.source)
     )
 
 
 class BramaIntegrationSwitch(BramaIntegrationEntity, SwitchEntity):
     """brama_integration switch class."""
 
+    entity_description: BramaIntegrationSwitchEntityDescription
+
     def __init__(
         self,
         coordinator: BlueprintDataUpdateCoordinator,
-        entity_description: SwitchEntityDescription,
+        entity_description: BramaIntegrationSwitchEntityDescription,
     ) -> None:
         """Initialize the switch class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description.source)
         self.entity_description = entity_description
         self._attr_unique_id = (
             f"{coordinator.config_entry.entry_id}_{DOMAIN}_{entity_description.key}"
         )
 
     @property
-    def is_on(self) -> bool:
+    def is_on(self) -> bool | None:
         """Return true if the switch is on."""
-        if self.entity_description.key == "power":
-            return self.coordinator.data.get("status", {}).get("amp_pwr", False)
-        if self.entity_description.key == "mute":
-            return self.coordinator.data.get("settings", {}).get("muted", False)
-        if self.entity_description.key == "htb":
-            return self.coordinator.data.get("settings", {}).get("htb", False)
-        if self.entity_description.key == "triode":
-            return self.coordinator.data.get("settings", {}).get("mix", 0)
-        return False
+        value = self.source_value
+        return None if value is None else bool(value)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the measured warm-up time of switches with a transition."""
+        if not self.entity_description.transition:
+            return None
+        warm_up_time = self.coordinator.transition_times.get(
+            (self._source_key, self.entity_description.raw_value_fn(True))  # noqa: FBT003
+        )
+        return {
+            "warm_up_time": None if warm_up_time is None else round(warm_up_time, 1)
+        }
 
     async def async_turn_on(self, **_: Any) -> None:
         """Turn on the switch."""
-        if self.entity_description.key == "power":
-            await self.coordinator.config_entry.runtime_data.client.async_set_power(
-                PowerMethod.ON
-            )
-        elif self.entity_description.key == "mute":
-            await self.coordinator.config_entry.runtime_data.client.async_set_muted(
-                MuteMethod.MUTED
-            )
-        elif self.entity_description.key == "htb":
-            await self.coordinator.config_entry.runtime_data.client.async_set_htb(
-                HtbMethod.ENABLED
-            )
-        elif self.entity_description.key == "triode":
-            await self.coordinator.config_entry.runtime_data.client.async_set_triode(1)
-        await self.coordinator.async_request_refresh()
+        await self._async_write_state(state=True)
 
     async def async_turn_off(self, **_: Any) -> None:
         """Turn off the switch."""
-        if self.entity_description.key == "power":
-            await self.coordinator.config_entry.runtime_data.client.async_set_power(
-                PowerMethod.OFF
-            )
-        elif self.entity_description.key == "mute":
-            await self.coordinator.config_entry.runtime_data.client.async_set_muted(
-                MuteMethod.UNMUTED
-            )
-        elif self.entity_description.key == "htb":
-            await self.coordinator.config_entry.runtime_data.client.async_set_htb(
-                HtbMethod.DISABLED
-            )
-        elif self.entity_description.key == "triode":
-            await self.coordinator.config_entry.runtime_data.client.async_set_triode(0)
-        await self.coordinator.async_request_refresh()
+        await self._async_write_state(state=False)
+
+    async def _async_write_state(self, *, state: bool) -> None:
+        """Send the new switch state to the amp and apply it optimistically."""
+        await self.async_write_source_value(
+            self.entity_description.raw_value_fn(state),
+            self.entity_description.set_fn(
+                self.coordinator.config_entry.runtime_data.client, state
+            ),
+            transition=self.entity_description.transition,
+        )
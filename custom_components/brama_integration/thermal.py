@@ -0,0 +1,129 @@
+"""Temperature trend tracking and burst sampling for brama_integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    LOGGER,
+    THERMAL_KEYS,
+    THERMAL_LEVEL_HYSTERESIS,
+    THERMAL_LEVEL_THRESHOLD,
+    THERMAL_LIMIT,
+    THERMAL_SLOPE_THRESHOLD,
+    THERMAL_TREND_WINDOW,
+    THERMAL_WARNING_HORIZON,
+)
+
+if TYPE_CHECKING:
+    from .data import StatusSnapshot
+
+
+class ThermalTrend:
+    """Rate of change of one temperature, fitted over its recent samples."""
+
+    __slots__ = ("_samples",)
+
+    def __init__(self) -> None:
+        """Initialize an empty trend."""
+        self._samples: deque[tuple[float, float]] = deque()
+
+    def add(self, when: float, value: float) -> None:
+        """Add a sample taken at a monotonic time, dropping the expired ones."""
+        self._samples.append((when, value))
+        horizon = when - THERMAL_TREND_WINDOW.total_seconds()
+        while self._samples[0][0] < horizon:
+            self._samples.popleft()
+
+    @property
+    def slope(self) -> float | None:
+        """Return the least squares slope in °C per second."""
+        if len(self._samples) < 3:  # noqa: PLR2004
+            return None
+        count = len(self._samples)
+        mean_t = sum(when for when, _ in self._samples) / count
+        mean_v = sum(value for _, value in self._samples) / count
+        spread = sum((when - mean_t) ** 2 for when, _ in self._samples)
+        if not spread:
+            return None
+        return (
+            sum((when - mean_t) * (value - mean_v) for when, value in self._samples)
+            / spread
+        )
+
+
+class ThermalMonitor:
+    """
+    Trend of the output stage temperatures of an amp.
+
+    Tells the coordinator when to sample the status at a high rate, and
+    which temperatures are projected to reach THERMAL_LIMIT soon.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self._trends = {key: ThermalTrend() for key in THERMAL_KEYS}
+        self.burst = False
+        # Temperatures a warning was fired for, until their projection clears
+        self._warned: set[str] = set()
+
+    def update(self, when: float, status: StatusSnapshot) -> list[dict[str, Any]]:
+        """Add the temperatures of a status and return the warnings to fire."""
+        warnings = []
+        rising = hot = False
+        relaxed = True
+        for key, trend in self._trends.items():
+            if (value := status.get(key)) is None:
+                continue
+            trend.add(when, value)
+            slope = trend.slope or 0.0
+            rising |= slope >= THERMAL_SLOPE_THRESHOLD
+            hot |= value >= THERMAL_LEVEL_THRESHOLD
+            relaxed &= (
+                slope < THERMAL_SLOPE_THRESHOLD / 2
+                and value < THERMAL_LEVEL_THRESHOLD - THERMAL_LEVEL_HYSTERESIS
+            )
+
+            seconds_to_limit = _seconds_to_limit(value, slope)
+            if (
+                seconds_to_limit is None
+                or seconds_to_limit > THERMAL_WARNING_HORIZON.total_seconds()
+            ):
+                self._warned.discard(key)
+            elif key not in self._warned:
+                self._warned.add(key)
+                warnings.append(
+                    {
+                        "sensor": key,
+                        "temperature": value,
+                        "rate": round(slope * 60, 2),
+                        "limit": THERMAL_LIMIT,
+                        "seconds_to_limit": round(seconds_to_limit),
+                    }
+                )
+
+        if not self.burst and (rising or hot):
+            LOGGER.debug("Temperatures rising, sampling the status at a high rate")
+            self.burst = True
+        elif self.burst and relaxed:
+            LOGGER.debug("Temperatures settled, sampling the status normally")
+            self.burst = False
+        return warnings
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the monitor for diagnostics."""
+        return {
+            "burst": self.burst,
+            "slopes": {key: trend.slope for key, trend in self._trends.items()},
+            "warned": sorted(self._warned),
+        }
+
+
+def _seconds_to_limit(value: float, slope: float) -> float | None:
+    """Return in how many seconds a temperature reaches the limit at its slope."""
+    if value >= THERMAL_LIMIT:
+        return 0
+    if slope <= 0:
+        return None
+    return (THERMAL_LIMIT - value) / slope
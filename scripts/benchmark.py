@@ -0,0 +1,245 @@
+"""
+Poll and command benchmark of brama_integration against simulated amps.
+
+Starts scripts/simulator.py in a separate process and drives the API client
+and the coordinator of every simulated amp:
+
+    scripts/benchmark --amps 8
+
+With --replay, the amps answer with recorded traffic through scripts/replay.py
+instead, one amp per recording:
+
+    scripts/benchmark --replay recording.jsonl.gz --speed 10
+
+Reports the refresh latency percentiles, the commands per second and the
+event loop (CPU) time spent per poll.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from brama_integration.api import BramaIntegrationApiClient
+from brama_integration.const import DOMAIN
+from brama_integration.coordinator import BlueprintDataUpdateCoordinator
+from brama_integration.data import BramaIntegrationData
+from brama_integration.scheduler import BramaPollScheduler
+from homeassistant import config_entries
+from homeassistant.const import CONF_IP_ADDRESS
+from homeassistant.core import HomeAssistant
+
+SIMULATOR = Path(__file__).with_name("simulator.py")
+REPLAY = Path(__file__).with_name("replay.py")
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    """Return the p50, p95 and p99 of the samples in milliseconds."""
+    if len(samples) < 2:  # noqa: PLR2004
+        samples = samples * 2 or [0.0, 0.0]
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": round(cuts[49] * 1000, 2),
+        "p95": round(cuts[94] * 1000, 2),
+        "p99": round(cuts[98] * 1000, 2),
+    }
+
+
+async def _async_start_simulator(
+    args: argparse.Namespace,
+) -> asyncio.subprocess.Process:
+    """Start the simulator or replay process and wait until it serves requests."""
+    if args.replay:
+        command = [
+            str(REPLAY),
+            *map(str, args.replay),
+            f"--port={args.port}",
+            f"--speed={args.speed}",
+        ]
+    else:
+        command = [
+            str(SIMULATOR),
+            f"--amps={args.amps}",
+            f"--port={args.port}",
+            f"--latency={args.latency}",
+            f"--jitter={args.jitter}",
+            f"--error-rate={args.error_rate}",
+        ]
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, *command, stdout=asyncio.subprocess.PIPE
+    )
+    assert process.stdout is not None  # noqa: S101
+    await process.stdout.readline()
+    return process
+
+
+def _create_coordinator(
+    hass: HomeAssistant,
+    scheduler: BramaPollScheduler,
+    ip_address: str,
+) -> BlueprintDataUpdateCoordinator:
+    """Create a coordinator and client for one amp outside of a config entry setup."""
+    entry = config_entries.ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=ip_address,
+        data={CONF_IP_ADDRESS: ip_address},
+        source=config_entries.SOURCE_USER,
+        options={},
+        unique_id=ip_address,
+    )
+    config_entries.current_entry.set(entry)
+    scheduler.async_register(entry.entry_id)
+    coordinator = BlueprintDataUpdateCoordinator(hass=hass, scheduler=scheduler)
+    entry.runtime_data = BramaIntegrationData(
+        client=BramaIntegrationApiClient(
+            ip_address=ip_address, request_slot=scheduler.async_request_slot
+        ),
+        coordinator=coordinator,
+        integration=None,  # type: ignore[arg-type]
+    )
+    return coordinator
+
+
+async def _async_benchmark_polls(
+    coordinators: list[BlueprintDataUpdateCoordinator],
+    rounds: int,
+) -> dict[str, Any]:
+    """Refresh every coordinator for a number of rounds."""
+    latencies: list[float] = []
+    failures = 0
+
+    async def _async_refresh(coordinator: BlueprintDataUpdateCoordinator) -> None:
+        nonlocal failures
+        # Fetch every endpoint, like a refresh right after setup
+        coordinator.async_invalidate("status", "settings", "info")
+        await coordinator.async_refresh()
+        if coordinator.last_update_success and coordinator.last_poll_duration:
+            latencies.append(coordinator.last_poll_duration)
+        else:
+            failures += 1
+
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    for _ in range(rounds):
+        await asyncio.gather(*(_async_refresh(c) for c in coordinators))
+    wall = time.monotonic() - wall_start
+    cpu = time.process_time() - cpu_start
+    polls = rounds * len(coordinators)
+    return {
+        "polls": polls,
+        "failures": failures,
+        "refresh_latency_ms": _percentiles(latencies),
+        "polls_per_second": round(polls / wall, 2),
+        "loop_time_per_poll_ms": round(cpu / polls * 1000, 3),
+    }
+
+
+async def _async_benchmark_commands(
+    clients: list[BramaIntegrationApiClient],
+    commands: int,
+) -> dict[str, Any]:
+    """
+    Send volume commands to every amp, one after the other per amp.
+
+    Each command waits for the previous one of its amp, so that none of them
+    is dropped by the coalescing of writes to the same key. Commands that are
+    superseded anyway and the POSTs that reached the amps are reported apart.
+    """
+    latencies: list[float] = []
+    superseded = 0
+    posts_before = sum(client.metrics["control"].requests for client in clients)
+
+    async def _async_commands(client: BramaIntegrationApiClient) -> None:
+        nonlocal superseded
+        for value in range(commands):
+            start = time.monotonic()
+            if await client.async_set_volume(value % 100) is None:
+                superseded += 1
+            else:
+                latencies.append(time.monotonic() - start)
+
+    wall_start = time.monotonic()
+    await asyncio.gather(*(_async_commands(client) for client in clients))
+    wall = time.monotonic() - wall_start
+    posts = sum(client.metrics["control"].requests for client in clients) - posts_before
+    return {
+        "commands": commands * len(clients),
+        "superseded": superseded,
+        "posts": posts,
+        "command_latency_ms": _percentiles(latencies),
+        "commands_per_second": round(len(latencies) / wall, 2),
+    }
+
+
+async def _async_main(args: argparse.Namespace) -> dict[str, Any]:
+    process = await _async_start_simulator(args)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        scheduler = BramaPollScheduler(poll_interval=timedelta(seconds=args.stagger))
+        coordinators = [
+            _create_coordinator(hass, scheduler, f"127.0.0.1:{args.port + index}")
+            for index in range(args.amps)
+        ]
+        clients = [c.config_entry.runtime_data.client for c in coordinators]
+        try:
+            results = {
+                "amps": args.amps,
+                "poll": await _async_benchmark_polls(coordinators, args.rounds),
+                "command": await _async_benchmark_commands(clients, args.commands),
+            }
+        finally:
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+            for client in clients:
+                await client.async_close()
+            process.terminate()
+            await process.wait()
+            await hass.async_stop(force=True)
+    return results
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--amps", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        nargs="+",
+        help="recordings to replay instead of simulating amps, one amp each",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="how many times faster than recorded replayed amps answer",
+    )
+    parser.add_argument(
+        "--stagger",
+        type=float,
+        default=0.0,
+        help="poll interval in seconds the fleet scheduler spreads polls over",
+    )
+    args = parser.parse_args()
+    if args.replay:
+        args.amps = len(args.replay)
+    return args
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(_async_main(_parse_args())), indent=2))
@@ -0,0 +1,103 @@
+"""
+Replay of recorded Brama API traffic.
+
+Serves the recordings saved by the brama_integration.stop_recording service,
+each on its own port like scripts/simulator.py, so that the client, the
+coordinator and every platform run unchanged against the traffic of a real amp:
+
+    scripts/replay recording.jsonl.gz --port 8100 --speed 10
+
+Responses take their recorded duration divided by --speed. Requests that timed
+out are not answered for their recorded duration, so the client runs into its
+own timeout, and connection errors close the connection.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from aiohttp import web
+from brama_integration.recording import TIMEOUT_ERROR, BramaRecording, BramaReplay
+
+
+class BramaReplayServer:
+    """Serves one recording, a single request at a time like the real amp."""
+
+    def __init__(self, replay: BramaReplay) -> None:
+        """Initialize the server."""
+        self.replay = replay
+        self._lock = asyncio.Lock()
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Answer a request with the next recorded exchange of its endpoint."""
+        async with self._lock:
+            exchange = self.replay.next_exchange(
+                request.method, request.match_info["endpoint"]
+            )
+            if exchange.error == TIMEOUT_ERROR:
+                await asyncio.sleep(exchange.duration)
+            else:
+                await asyncio.sleep(self.replay.delay(exchange))
+            if self.replay.is_failure(exchange):
+                if request.transport is not None:
+                    request.transport.close()
+                return web.Response()
+            return web.Response(
+                status=exchange.status or 200,
+                text=exchange.body or "",
+                content_type="application/json",
+            )
+
+    def create_app(self) -> web.Application:
+        """Return the aiohttp application serving the recording."""
+        app = web.Application()
+        app.add_routes([web.route("*", "/api/{endpoint}", self._handle)])
+        return app
+
+
+async def async_start_replays(
+    recordings: list[Path],
+    host: str = "127.0.0.1",
+    port: int = 8100,
+    speed: float = 1.0,
+) -> list[web.AppRunner]:
+    """Start a server for each recording on consecutive ports."""
+    runners = []
+    for index, path in enumerate(recordings):
+        recording = await asyncio.to_thread(BramaRecording.load, path)
+        server = BramaReplayServer(BramaReplay(recording, speed))
+        runner = web.AppRunner(server.create_app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port + index).start()
+        runners.append(runner)
+    return runners
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("recordings", type=Path, nargs="+")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="how many times faster than recorded the amps answer",
+    )
+    return parser.parse_args()
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    await async_start_replays(args.recordings, args.host, args.port, args.speed)
+    amps = len(args.recordings)
+    print(
+        f"Replaying {amps} amps on {args.host}:{args.port}-{args.port + amps - 1}",
+        flush=True,
+    )
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(_async_main(_parse_args()))
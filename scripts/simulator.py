@@ -0,0 +1,180 @@
+"""
+Simulator of the Brama embedded HTTP API.
+
+Serves /api/info, /api/settings, /api/status and /api/control for one or more
+simulated amps, each on its own port:
+
+    python3 scripts/simulator.py --amps 4 --port 8100 --latency 0.05
+
+Like the real amp, every simulated server handles a single request at a time
+unless --concurrent is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any
+
+from aiohttp import web
+
+
+class BramaSimulator:
+    """A single simulated amp."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        index: int = 0,
+        latency: float = 0.02,
+        jitter: float = 0.01,
+        error_rate: float = 0.0,
+        warm_up: float = 3.0,
+        *,
+        serial: bool = True,
+    ) -> None:
+        """Initialize the simulated amp."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.warm_up = warm_up
+        self.serial = serial
+        self.requests: dict[str, int] = {}
+        self._lock = asyncio.Lock()
+        self._power_target: tuple[bool, float] | None = None
+        self.info: dict[str, Any] = {
+            "name": f"Brama {index + 1}",
+            "mac": f"02:00:00:00:{index // 256:02x}:{index % 256:02x}",
+            "fw": "1.0.0",
+        }
+        self.settings: dict[str, Any] = {
+            "vol": 30,
+            "src": 0,
+            "gain": 1,
+            "led_lvl": 2,
+            "muted": False,
+            "htb": False,
+            "mix": 0,
+        }
+        self.status: dict[str, Any] = {
+            "amp_pwr": True,
+            "temp_l": 3500,
+            "temp_r": 3500,
+            "ac": 23000,
+        }
+
+    def _tick(self) -> None:
+        """Advance the simulated hardware state."""
+        if self._power_target is not None:
+            target, ready_at = self._power_target
+            if time.monotonic() >= ready_at:
+                self.status["amp_pwr"] = target
+                self._power_target = None
+        for key in ("temp_l", "temp_r"):
+            self.status[key] += random.randint(-5, 5)  # noqa: S311
+        self.status["ac"] = 23000 + random.randint(-50, 50)  # noqa: S311
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.Response:
+        """Add latency, errors and single request handling."""
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        if self.serial:
+            async with self._lock:
+                return await self._handle(request, handler)
+        return await self._handle(request, handler)
+
+    async def _handle(self, request: web.Request, handler: Any) -> web.Response:
+        """Handle a request after the simulated processing delay."""
+        await asyncio.sleep(self.latency + random.uniform(0, self.jitter))  # noqa: S311
+        if random.random() < self.error_rate:  # noqa: S311
+            raise web.HTTPInternalServerError
+        self._tick()
+        return await handler(request)
+
+    async def _get_info(self, _: web.Request) -> web.Response:
+        return web.json_response(self.info)
+
+    async def _get_settings(self, _: web.Request) -> web.Response:
+        return web.json_response(self.settings)
+
+    async def _get_status(self, _: web.Request) -> web.Response:
+        return web.json_response(self.status)
+
+    async def _post_control(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        if "power" in payload:
+            self._power_target = (
+                bool(payload["power"]),
+                time.monotonic() + (self.warm_up if payload["power"] else 0),
+            )
+        self.settings.update(payload.get("settings", {}))
+        return web.json_response({"result": "ok"})
+
+    def create_app(self) -> web.Application:
+        """Return the aiohttp application serving the API."""
+        app = web.Application(middlewares=[self._middleware])
+        app.add_routes(
+            [
+                web.get("/api/info", self._get_info),
+                web.get("/api/settings", self._get_settings),
+                web.get("/api/status", self._get_status),
+                web.post("/api/control", self._post_control),
+            ]
+        )
+        return app
+
+
+async def async_start_simulators(
+    amps: int,
+    host: str = "127.0.0.1",
+    port: int = 8100,
+    **kwargs: Any,
+) -> tuple[list[BramaSimulator], list[web.AppRunner]]:
+    """Start a simulator for each amp on consecutive ports."""
+    simulators = []
+    runners = []
+    for index in range(amps):
+        simulator = BramaSimulator(index, **kwargs)
+        runner = web.AppRunner(simulator.create_app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port + index).start()
+        simulators.append(simulator)
+        runners.append(runner)
+    return simulators, runners
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--amps", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--warm-up", type=float, default=3.0)
+    parser.add_argument("--concurrent", action="store_true")
+    return parser.parse_args()
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    await async_start_simulators(
+        args.amps,
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        warm_up=args.warm_up,
+        serial=not args.concurrent,
+    )
+    print(
+        f"Simulating {args.amps} amps on "
+        f"{args.host}:{args.port}-{args.port + args.amps - 1}",
+        flush=True,
+    )
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(_async_main(_parse_args()))
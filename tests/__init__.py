@@ -0,0 +1,125 @@
+"""Tests for brama_integration."""
+
+from __future__ import annotations
+
+import json
+from collections import deque
+from functools import partial
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.brama_integration.api import BramaIntegrationApiClient
+from custom_components.brama_integration.const import DOMAIN, INFO_FEATURES_KEY
+from custom_components.brama_integration.recording import (
+    BramaExchange,
+    BramaRecording,
+    BramaReplay,
+    BramaReplayResponse,
+    BramaReplaySession,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+IP_ADDRESS = "192.0.2.10"
+STARTED = "2024-06-05T00:00:00+00:00"
+
+STATUS = {"amp_pwr": True, "temp_l": 3500, "temp_r": 3600, "ac": 23000}
+SETTINGS = {
+    "vol": 30,
+    "src": 0,
+    "gain": 1,
+    "led_lvl": 2,
+    "muted": False,
+    "htb": False,
+    "mix": 0,
+}
+# An amp without the home theater bypass
+INFO = {
+    "name": "Brama",
+    "fw": "1.0.0",
+    INFO_FEATURES_KEY: sorted(set(SETTINGS) - {"htb"}),
+}
+
+
+def exchange(  # noqa: PLR0913
+    endpoint: str,
+    body: Any = None,
+    *,
+    method: str = "get",
+    status: int | None = 200,
+    error: str | None = None,
+    duration: float = 0.0,
+) -> BramaExchange:
+    """Return an exchange with a JSON encoded body, answered at once by default."""
+    return BramaExchange(
+        offset=0.0,
+        duration=duration,
+        method=method,
+        endpoint=endpoint,
+        status=None if error is not None else status,
+        body=None if body is None else json.dumps(body),
+        error=error,
+    )
+
+
+class LoggingReplaySession(BramaReplaySession):
+    """Replay session that also keeps the requests it was sent."""
+
+    def __init__(self, replay: BramaReplay) -> None:
+        """Initialize the session."""
+        super().__init__(replay)
+        self.requests: list[tuple[str, str, Any]] = []
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> BramaReplayResponse:
+        """Keep the request, with its decoded body, and answer it from the recording."""
+        body = kwargs.get("data")
+        self.requests.append(
+            (method, url.rsplit("/", 1)[-1], None if body is None else json.loads(body))
+        )
+        return await super().request(method, url, **kwargs)
+
+
+# Factory of the replay_client fixture, creating a client answered by exchanges
+type ReplayClientFactory = Callable[
+    ..., tuple[BramaIntegrationApiClient, LoggingReplaySession]
+]
+
+
+async def async_setup_replay(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    *exchanges: BramaExchange,
+) -> LoggingReplaySession:
+    """Set up an entry whose client is answered by exchanges, and refresh it."""
+    session = LoggingReplaySession(
+        BramaReplay(BramaRecording(IP_ADDRESS, STARTED, deque(exchanges)))
+    )
+    with patch(
+        "custom_components.brama_integration.BramaIntegrationApiClient",
+        partial(BramaIntegrationApiClient, session=session),
+    ):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        # The first refresh runs as a background task of the entry
+        await hass.async_block_till_done(wait_background_tasks=True)
+    assert config_entry.runtime_data.coordinator.last_update_success
+    return session
+
+
+def get_entity_id(
+    hass: HomeAssistant, config_entry: MockConfigEntry, platform: str, key: str
+) -> str | None:
+    """Return the entity ID of an entity of the entry, None if it does not exist."""
+    return er.async_get(hass).async_get_entity_id(
+        platform, DOMAIN, f"{config_entry.entry_id}_{DOMAIN}_{key}"
+    )
@@ -0,0 +1,74 @@
+"""Fixtures for brama_integration tests."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import CONF_IP_ADDRESS
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.brama_integration.api import BramaIntegrationApiClient
+from custom_components.brama_integration.const import DOMAIN, STORAGE_VERSION
+from custom_components.brama_integration.recording import BramaRecording, BramaReplay
+
+from . import (
+    INFO,
+    IP_ADDRESS,
+    SETTINGS,
+    STARTED,
+    LoggingReplaySession,
+    ReplayClientFactory,
+)
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.brama_integration.recording import BramaExchange
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Let Home Assistant load the integration from custom_components."""
+
+
+@pytest.fixture
+def replay_client() -> ReplayClientFactory:
+    """Return a factory of clients whose requests are answered by exchanges."""
+
+    def _create(
+        *exchanges: BramaExchange,
+    ) -> tuple[BramaIntegrationApiClient, LoggingReplaySession]:
+        session = LoggingReplaySession(
+            BramaReplay(BramaRecording(IP_ADDRESS, STARTED, deque(exchanges)))
+        )
+        return BramaIntegrationApiClient(IP_ADDRESS, session=session), session
+
+    return _create
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return an entry of an amp that was added to Home Assistant."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=IP_ADDRESS,
+        unique_id="02:00:00:00:00:01",
+        data={CONF_IP_ADDRESS: IP_ADDRESS},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+def stored_state(hass_storage: dict[str, Any], config_entry: MockConfigEntry) -> None:
+    """Store the last known info and settings of the amp."""
+    hass_storage[f"{DOMAIN}.{config_entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{config_entry.entry_id}",
+        "data": {"info": INFO, "settings": SETTINGS},
+    }
@@ -0,0 +1,364 @@
+"""Tests for the API client of brama_integration."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.helpers.json import json_bytes
+
+from custom_components.brama_integration.api import (
+    BramaIntegrationApiClient,
+    BramaIntegrationApiClientCommunicationError,
+    BramaIntegrationApiClientError,
+    _CircuitBreaker,
+    _RequestQueue,
+)
+from custom_components.brama_integration.const import (
+    CIRCUIT_BACKOFF_BASE,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CONTROL_BATCH_WINDOW,
+    CircuitState,
+    RequestPriority,
+)
+from custom_components.brama_integration.recording import TIMEOUT_ERROR
+
+from . import IP_ADDRESS, SETTINGS, STATUS, exchange
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+
+    from . import ReplayClientFactory
+
+# Seconds after which the first back-off has elapsed, whatever its jitter
+FIRST_BACKOFF_ELAPSED = CIRCUIT_BACKOFF_BASE * 2
+
+
+def _open_circuit() -> _CircuitBreaker:
+    """Return a circuit breaker that was just opened."""
+    circuit = _CircuitBreaker("amp")
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        circuit.record_failure()
+    return circuit
+
+
+def test_circuit_opens_after_threshold() -> None:
+    """Test that consecutive failures open the circuit."""
+    circuit = _CircuitBreaker("amp")
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD - 1):
+        circuit.record_failure()
+    assert circuit.state is CircuitState.CLOSED
+    assert circuit.before_request() is False
+
+    circuit.record_failure()
+    assert circuit.state is CircuitState.OPEN
+    with pytest.raises(BramaIntegrationApiClientCommunicationError):
+        circuit.before_request()
+
+
+def test_circuit_lets_one_probe_through(freezer: FrozenDateTimeFactory) -> None:
+    """Test that a half-open circuit lets a single probe through."""
+    circuit = _open_circuit()
+    freezer.tick(FIRST_BACKOFF_ELAPSED)
+
+    assert circuit.before_request() is True
+    assert circuit.state is CircuitState.HALF_OPEN
+    with pytest.raises(BramaIntegrationApiClientCommunicationError):
+        circuit.before_request()
+
+    circuit.record_success()
+    assert circuit.state is CircuitState.CLOSED
+    assert circuit.before_request() is False
+
+
+def test_circuit_reopens_after_failed_probe(freezer: FrozenDateTimeFactory) -> None:
+    """Test that a failed probe opens the circuit again."""
+    circuit = _open_circuit()
+    freezer.tick(FIRST_BACKOFF_ELAPSED)
+    assert circuit.before_request() is True
+
+    circuit.record_failure()
+    assert circuit.state is CircuitState.OPEN
+    with pytest.raises(BramaIntegrationApiClientCommunicationError):
+        circuit.before_request()
+
+
+def test_circuit_ended_probe_lets_next_through(
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that a probe ending without a verdict does not keep the circuit shut."""
+    circuit = _open_circuit()
+    freezer.tick(FIRST_BACKOFF_ELAPSED)
+    assert circuit.before_request() is True
+
+    circuit.end_probe()
+    assert circuit.before_request() is True
+
+
+async def test_bad_payload_keeps_circuit_open(
+    freezer: FrozenDateTimeFactory,
+    replay_client: ReplayClientFactory,
+) -> None:
+    """Test that an answer that cannot be decoded does not close the circuit."""
+    client, _ = replay_client(
+        *(exchange("status", error=TIMEOUT_ERROR),) * CIRCUIT_FAILURE_THRESHOLD,
+        exchange("status", [STATUS]),
+    )
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        with pytest.raises(BramaIntegrationApiClientCommunicationError):
+            await client.async_get_status()
+    assert client.circuit_state is CircuitState.OPEN
+    assert client.metrics["status"].timeouts == CIRCUIT_FAILURE_THRESHOLD
+
+    freezer.tick(FIRST_BACKOFF_ELAPSED)
+    with pytest.raises(BramaIntegrationApiClientError) as exc_info:
+        await client.async_get_status()
+    assert not isinstance(exc_info.value, BramaIntegrationApiClientCommunicationError)
+    assert client.circuit_state is CircuitState.HALF_OPEN
+
+
+async def test_cancelled_probe_is_released(
+    freezer: FrozenDateTimeFactory,
+    replay_client: ReplayClientFactory,
+) -> None:
+    """Test that cancelling the probe lets the next request probe again."""
+    client, _ = replay_client(
+        *(exchange("status", error=TIMEOUT_ERROR),) * CIRCUIT_FAILURE_THRESHOLD,
+        exchange("status", STATUS, duration=60),
+        exchange("status", STATUS),
+    )
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        with pytest.raises(BramaIntegrationApiClientCommunicationError):
+            await client.async_get_status()
+    freezer.tick(FIRST_BACKOFF_ELAPSED)
+
+    probe = asyncio.create_task(client.async_probe())
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert (await client.async_get_status()).get("amp_pwr") is True
+    assert client.circuit_state is CircuitState.CLOSED
+
+
+async def test_request_queue_serves_commands_first() -> None:
+    """Test that waiting requests take their turn by priority, then in order."""
+    queue = _RequestQueue()
+    order: list[str] = []
+
+    async def _request(name: str, priority: RequestPriority) -> None:
+        async with queue.async_turn(priority):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async with queue.async_turn(RequestPriority.POLL):
+        tasks = [
+            asyncio.create_task(_request("poll 1", RequestPriority.POLL)),
+            asyncio.create_task(_request("command", RequestPriority.COMMAND)),
+            asyncio.create_task(_request("poll 2", RequestPriority.POLL)),
+        ]
+        await asyncio.sleep(0)
+        assert order == []
+    await asyncio.gather(*tasks)
+
+    assert order == ["command", "poll 1", "poll 2"]
+
+
+async def test_request_queue_skips_cancelled_waiters() -> None:
+    """Test that a waiter giving up does not hold up the others."""
+    queue = _RequestQueue()
+    order: list[str] = []
+
+    async def _request(name: str) -> None:
+        async with queue.async_turn(RequestPriority.POLL):
+            order.append(name)
+
+    async with queue.async_turn(RequestPriority.POLL):
+        cancelled = asyncio.create_task(_request("cancelled"))
+        waiting = asyncio.create_task(_request("waiting"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+    await waiting
+
+    assert cancelled.cancelled()
+    assert order == ["waiting"]
+    # The queue is free again
+    async with asyncio.timeout(1), queue.async_turn(RequestPriority.POLL):
+        pass
+
+
+async def test_control_writes_are_coalesced(replay_client: ReplayClientFactory) -> None:
+    """Test that writes within the batch window are sent as a single request."""
+    client, session = replay_client(exchange("control", {}, method="post"))
+
+    results = await asyncio.gather(
+        client.async_set_volume(10),
+        client.async_set_volume(20),
+        client.async_set_input(1),
+    )
+
+    assert session.requests == [
+        ("post", "control", {"settings": {"vol": 20, "src": 1}}),
+    ]
+    # The superseded write returns right away without a result
+    assert results == [None, {}, {}]
+    assert client.metrics["control"].requests == 1
+    assert not client.is_control_pending("vol")
+
+
+async def test_sequential_writes_skip_the_window(
+    replay_client: ReplayClientFactory,
+) -> None:
+    """Test that a lone write to an idle amp is sent without waiting."""
+    client, session = replay_client(exchange("control", {}, method="post"))
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await client.async_set_volume(10)
+    await client.async_set_input(1)
+
+    assert loop.time() - start < CONTROL_BATCH_WINDOW
+    assert session.requests == [
+        ("post", "control", {"settings": {"vol": 10}}),
+        ("post", "control", {"settings": {"src": 1}}),
+    ]
+
+
+async def test_metrics_leave_out_the_wait_in_line(
+    replay_client: ReplayClientFactory,
+) -> None:
+    """Test that the latency of a request starts once it is its turn."""
+    client, _ = replay_client(
+        exchange("status", STATUS, duration=0.05),
+        exchange("settings", SETTINGS, duration=0.05),
+        exchange("control", {}, method="post"),
+    )
+
+    # The settings wait for the status to be answered
+    await asyncio.gather(client.async_get_status(), client.async_get_settings())
+    await client.async_set_volume(10)
+
+    assert 0.05 <= client.metrics["settings"].last_latency < 0.1
+    assert client.metrics["settings"].latency.count == 1
+    assert client.metrics["status"].bytes_sent == 0
+    assert client.metrics["control"].bytes_sent == len(
+        json_bytes({"settings": {"vol": 10}})
+    )
+
+
+async def test_control_batch_is_sent_on_exit(
+    replay_client: ReplayClientFactory,
+) -> None:
+    """Test that a control batch is sent as one request when it is left."""
+    client, session = replay_client(exchange("control", {}, method="post"))
+
+    async with client.async_control_batch() as batch:
+        batch["src"] = 2
+        batch["vol"] = 40
+        assert session.requests == []
+
+    assert session.requests == [
+        ("post", "control", {"settings": {"src": 2, "vol": 40}}),
+    ]
+
+
+async def test_failed_control_write_raises(replay_client: ReplayClientFactory) -> None:
+    """Test that every write of a failed batch gets the error."""
+    client, _ = replay_client(exchange("control", method="post", error="reset"))
+
+    results = await asyncio.gather(
+        client.async_set_volume(10),
+        client.async_set_input(1),
+        return_exceptions=True,
+    )
+
+    assert all(
+        isinstance(result, BramaIntegrationApiClientCommunicationError)
+        for result in results
+    )
+
+
+async def test_command_goes_before_queued_poll(
+    replay_client: ReplayClientFactory,
+) -> None:
+    """Test that a poll arriving during the batch window waits for the command."""
+    client, session = replay_client(
+        exchange("control", {}, method="post"),
+        exchange("settings", SETTINGS),
+    )
+
+    write = asyncio.create_task(client.async_set_volume(10))
+    await asyncio.sleep(0)
+    await asyncio.gather(write, client.async_get_settings())
+
+    assert [endpoint for _, endpoint, _ in session.requests] == [
+        "control",
+        "settings",
+    ]
+
+
+async def test_concurrent_polls_share_a_request(
+    replay_client: ReplayClientFactory,
+) -> None:
+    """Test that polls of an endpoint waiting for their turn share a request."""
+    client, session = replay_client(exchange("status", STATUS))
+
+    first, second = await asyncio.gather(
+        client.async_get_status(), client.async_get_status()
+    )
+
+    assert first is second
+    assert len(session.requests) == 1
+
+
+async def test_unchanged_payload_returns_same_snapshot(
+    replay_client: ReplayClientFactory,
+) -> None:
+    """Test that an unchanged payload is not decoded again."""
+    changed = {**STATUS, "ac": 23100}
+    client, _ = replay_client(
+        exchange("status", STATUS),
+        exchange("status", STATUS),
+        exchange("status", changed),
+    )
+
+    first = await client.async_get_status()
+    second = await client.async_get_status()
+    third = await client.async_get_status()
+
+    assert second is first
+    assert third is not first
+    assert third.get("ac") == changed["ac"] / 100
+
+
+async def test_closed_client_sends_nothing() -> None:
+    """Test that a request after closing does not open a new session."""
+    client = BramaIntegrationApiClient(IP_ADDRESS)
+    await client.async_close()
+
+    with pytest.raises(BramaIntegrationApiClientError, match="closed"):
+        await client.async_get_status()
+    with pytest.raises(BramaIntegrationApiClientError):
+        await client.async_set_volume(10)
+    assert client._session is None
+
+
+async def test_close_fails_unsent_writes(replay_client: ReplayClientFactory) -> None:
+    """Test that closing the client fails the writes in flight and waiting."""
+    client, session = replay_client(exchange("control", {}, method="post", duration=60))
+    in_flight = asyncio.create_task(client.async_set_volume(10))
+    # A lone write is sent right away, and answered only after a minute
+    await asyncio.sleep(CONTROL_BATCH_WINDOW)
+    assert session.requests
+    waiting = asyncio.create_task(client.async_set_input(1))
+    await asyncio.sleep(0)
+
+    await client.async_close()
+
+    for write in (in_flight, waiting):
+        with pytest.raises(BramaIntegrationApiClientError, match="not sent"):
+            await write
+    assert not client.is_control_pending("src")
@@ -0,0 +1,111 @@
+"""Tests for the config and options flows of brama_integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_IP_ADDRESS
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.brama_integration.const import (
+    CONF_DEADBAND,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_REQUEST_TIMEOUT,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DOMAIN,
+    REQUEST_TIMEOUT,
+)
+from custom_components.brama_integration.data import InfoSnapshot
+
+from . import IP_ADDRESS
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+async def test_options_flow_keeps_other_options(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that the options flow stores the form on top of the existing options."""
+    hass.config_entries.async_update_entry(config_entry, options={"other": True})
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_IP_ADDRESS: IP_ADDRESS,
+            CONF_MIN_POLL_INTERVAL: 2,
+            f"temp_l_{CONF_DEADBAND}": 0.2,
+            f"ac_voltage_{CONF_MIN_PUBLISH_INTERVAL}": 300,
+        },
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert config_entry.options["other"] is True
+    assert config_entry.options[CONF_MIN_POLL_INTERVAL] == 2
+    assert config_entry.options[f"temp_l_{CONF_DEADBAND}"] == 0.2
+    assert config_entry.options[f"ac_voltage_{CONF_MIN_PUBLISH_INTERVAL}"] == 300
+    # Fields left out of the form are stored with their defaults
+    assert config_entry.options[CONF_REQUEST_TIMEOUT] == REQUEST_TIMEOUT
+    assert (
+        config_entry.options[CONF_MAX_POLL_INTERVAL]
+        == DEFAULT_MAX_POLL_INTERVAL.total_seconds()
+    )
+    assert CONF_IP_ADDRESS not in config_entry.options
+
+
+async def test_options_flow_rejects_inverted_poll_intervals(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that the minimum poll interval may not exceed the maximum."""
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_IP_ADDRESS: IP_ADDRESS,
+            CONF_MIN_POLL_INTERVAL: 60,
+            CONF_MAX_POLL_INTERVAL: 30,
+        },
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "poll_interval_range"}
+    assert config_entry.options == {}
+
+
+async def test_discovery_offers_amps_without_unique_id(hass: HomeAssistant) -> None:
+    """Test that an amp reporting no MAC or serial can still be picked."""
+    info = InfoSnapshot.from_payload({"name": "Brama"})
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    with patch(
+        "custom_components.brama_integration.config_flow.async_discover_devices",
+        return_value={IP_ADDRESS: (None, info)},
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"next_step_id": "discovery"}
+        )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "discovery"
+
+    with patch(
+        "custom_components.brama_integration.async_setup_entry", return_value=True
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_IP_ADDRESS: IP_ADDRESS}
+        )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_IP_ADDRESS: IP_ADDRESS}
+    assert result["result"].unique_id is None
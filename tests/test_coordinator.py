@@ -0,0 +1,263 @@
+"""Tests for the coordinator of brama_integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from functools import partial
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.brama_integration.const import (
+    CIRCUIT_BACKOFF_BASE,
+    CIRCUIT_FAILURE_THRESHOLD,
+    OPTIMISTIC_VERIFY_DELAY,
+    CircuitState,
+)
+
+from . import (
+    INFO,
+    SETTINGS,
+    STATUS,
+    async_setup_replay,
+    exchange,
+    get_entity_id,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from . import LoggingReplaySession
+
+
+@pytest.fixture
+async def session(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    stored_state: None,  # noqa: ARG001
+) -> AsyncIterator[LoggingReplaySession]:
+    """Set up an amp answering with its settings and accepting every write."""
+    session = await async_setup_replay(
+        hass,
+        config_entry,
+        exchange("status", STATUS),
+        exchange("settings", SETTINGS),
+        exchange("info", INFO),
+        exchange("control", {}, method="post"),
+    )
+    yield session
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def _async_verify(hass: HomeAssistant) -> None:
+    """Let the verification of optimistically written values run."""
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=OPTIMISTIC_VERIFY_DELAY)
+    )
+    await hass.async_block_till_done()
+
+
+@pytest.mark.usefixtures("session")
+async def test_cancelled_write_is_verified(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that a cancelled write does not keep its value over later polls."""
+    coordinator = config_entry.runtime_data.coordinator
+    write = asyncio.create_task(
+        coordinator.async_write("settings", "muted", True, asyncio.Event().wait())  # noqa: FBT003
+    )
+    await asyncio.sleep(0)
+    assert coordinator.data["settings"].get("muted") is True
+
+    write.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await write
+    await _async_verify(hass)
+
+    # The amp never took the value
+    assert coordinator.data["settings"].get("muted") is False
+    assert not coordinator._expected.get("settings")
+    assert not coordinator._last_writes
+
+
+async def _async_start_ramp(config_entry: MockConfigEntry, target: int) -> asyncio.Task:
+    """Start a long ramp of the volume that jumps to its target at once."""
+    coordinator = config_entry.runtime_data.coordinator
+    # Not a task of hass, waiting for the ramp to end would take a minute
+    ramp = asyncio.create_task(
+        coordinator.async_ramp("settings", "vol", target, 60, lambda _: 1, AsyncMock())
+    )
+    await asyncio.sleep(0)
+    assert coordinator.data["settings"].get("vol") == target
+    return ramp
+
+
+@pytest.mark.usefixtures("session")
+async def test_verify_keeps_value_of_running_ramp(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that a verification leaves the values of a ramp in progress alone."""
+    coordinator = config_entry.runtime_data.coordinator
+    ramp = await _async_start_ramp(config_entry, 50)
+
+    await coordinator.async_write(
+        "settings",
+        "muted",
+        True,  # noqa: FBT003
+        config_entry.runtime_data.client.async_set_control("muted", True),  # noqa: FBT003
+    )
+    await _async_verify(hass)
+
+    assert coordinator.data["settings"].get("vol") == 50
+    assert coordinator._expected["settings"] == {"vol": 50}
+
+    ramp.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await ramp
+    await _async_verify(hass)
+
+    assert coordinator.data["settings"].get("vol") == SETTINGS["vol"]
+    assert not coordinator._expected["settings"]
+
+
+@pytest.mark.usefixtures("session")
+async def test_replaced_ramp_does_not_verify(config_entry: MockConfigEntry) -> None:
+    """Test that only the ramp that took over verifies the value."""
+    coordinator = config_entry.runtime_data.coordinator
+    first = await _async_start_ramp(config_entry, 50)
+
+    second = await _async_start_ramp(config_entry, 60)
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    assert "settings" not in coordinator._verify_unsubs
+    assert coordinator._ramps["vol"] is second
+
+    second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    assert "settings" in coordinator._verify_unsubs
+
+
+@pytest.mark.usefixtures("stored_state")
+async def test_warm_up_time_is_shown(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that the time the amp took to turn on reaches the power switch."""
+    await async_setup_replay(
+        hass,
+        config_entry,
+        exchange("status", {**STATUS, "amp_pwr": False}),
+        exchange("status", STATUS),
+        exchange("settings", SETTINGS),
+        exchange("info", INFO),
+        exchange("control", {}, method="post"),
+    )
+    entity_id = get_entity_id(hass, config_entry, "switch", "power")
+    assert hass.states.get(entity_id).state == "off"
+    assert hass.states.get(entity_id).attributes["warm_up_time"] is None
+
+    with patch(
+        "custom_components.brama_integration.coordinator.TRANSITION_POLL_INTERVAL",
+        0,
+    ):
+        await hass.services.async_call(
+            "switch", "turn_on", {"entity_id": entity_id}, blocking=True
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get(entity_id)
+    assert state.state == "on"
+    assert state.attributes["warm_up_time"] is not None
+    assert ("amp_pwr", True) in config_entry.runtime_data.coordinator.transition_times
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+@pytest.mark.usefixtures("session")
+async def test_listeners_are_notified_of_their_keys(
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that a listener is only notified of the values it reads."""
+    coordinator = config_entry.runtime_data.coordinator
+    calls: list[str] = []
+    for name, context in (
+        ("all", None),
+        ("vol", frozenset({("settings", "vol")})),
+        ("muted", frozenset({("settings", "muted")})),
+    ):
+        config_entry.async_on_unload(
+            coordinator.async_add_listener(partial(calls.append, name), context)
+        )
+
+    settings = coordinator.data["settings"].replace(vol=40)
+    coordinator.async_set_updated_data({**coordinator.data, "settings": settings})
+    assert calls == ["all", "vol"]
+
+    # Nothing changed, so nobody is notified
+    calls.clear()
+    coordinator.async_set_updated_data({**coordinator.data})
+    assert calls == []
+
+
+async def test_concurrent_writes_share_a_request(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    session: LoggingReplaySession,
+) -> None:
+    """Test that writes of several entities at once are sent as one request."""
+    volume = get_entity_id(hass, config_entry, "number", "volume")
+    mute = get_entity_id(hass, config_entry, "switch", "mute")
+
+    await asyncio.gather(
+        hass.services.async_call(
+            "number", "set_value", {"entity_id": volume, "value": 40}, blocking=True
+        ),
+        hass.services.async_call(
+            "switch", "turn_on", {"entity_id": mute}, blocking=True
+        ),
+    )
+
+    assert [request for request in session.requests if request[0] == "post"] == [
+        ("post", "control", {"settings": {"vol": 40, "muted": 1}})
+    ]
+    assert hass.states.get(volume).state == "40"
+    assert hass.states.get(mute).state == "on"
+
+
+async def test_refresh_probes_open_circuit(
+    config_entry: MockConfigEntry,
+    session: LoggingReplaySession,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that an amp behind an open circuit is probed before it is polled."""
+    coordinator = config_entry.runtime_data.coordinator
+    client = config_entry.runtime_data.client
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        client._circuit.record_failure()
+    session.requests.clear()
+
+    # Until the back-off is over, nothing is sent
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert session.requests == []
+    assert client.metrics["status"].rejected == 1
+
+    freezer.tick(CIRCUIT_BACKOFF_BASE * 2)
+    coordinator.async_invalidate("status")
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert client.circuit_state is CircuitState.CLOSED
+    assert session.requests[:2] == [("get", "status", None), ("get", "status", None)]
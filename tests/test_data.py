@@ -0,0 +1,111 @@
+"""Tests for the snapshots and capabilities of brama_integration."""
+
+from __future__ import annotations
+
+from custom_components.brama_integration.const import (
+    INFO_FEATURES_KEY,
+    INFO_INPUTS_KEY,
+)
+from custom_components.brama_integration.coordinator import (
+    _changed_keys,
+    _is_activity,
+)
+from custom_components.brama_integration.data import (
+    BramaCapabilities,
+    InfoSnapshot,
+    SettingsSnapshot,
+    StatusSnapshot,
+)
+
+from . import SETTINGS, STATUS
+
+
+def test_snapshot_scales_payload() -> None:
+    """Test that scaled values are converted once while decoding."""
+    status = StatusSnapshot.from_payload(STATUS)
+
+    assert status.get("ac") == STATUS["ac"] / 100
+    assert status.get("temp_l") == STATUS["temp_l"] / 100
+    assert status.get("amp_pwr") is True
+    assert StatusSnapshot.from_dict(status.as_dict()) == status
+
+
+def test_snapshot_replace_makes_a_copy() -> None:
+    """Test that replace leaves the original snapshot as it was."""
+    settings = SettingsSnapshot.from_payload(SETTINGS)
+
+    changed = settings.replace(vol=40)
+
+    assert changed.get("vol") == 40
+    assert settings.get("vol") == SETTINGS["vol"]
+    assert changed != settings
+    assert settings.replace() == settings
+
+
+def test_snapshot_changed_keys() -> None:
+    """Test that only the keys whose value differs are reported."""
+    settings = SettingsSnapshot.from_payload(SETTINGS)
+
+    assert list(settings.changed_keys(settings.replace(src=1, muted=True))) == [
+        "muted",
+        "src",
+    ]
+    assert list(settings.changed_keys(settings)) == []
+    assert set(settings.changed_keys(None)) == set(SETTINGS)
+
+
+def test_changed_keys_between_polls() -> None:
+    """Test that the changed (endpoint, key) pairs of two polls are found."""
+    status = StatusSnapshot.from_payload(STATUS)
+    settings = SettingsSnapshot.from_payload(SETTINGS)
+    info = InfoSnapshot.from_payload({"fw": "1.0.0"})
+
+    assert _changed_keys({"status": status}, {"status": status}) == set()
+    assert _changed_keys(
+        {"status": status, "settings": settings},
+        {"status": status.replace(amp_pwr=False), "info": info},
+    ) == {
+        ("status", "amp_pwr"),
+        ("info", "payload"),
+        *(("settings", key) for key in SETTINGS),
+    }
+
+
+def test_mains_jitter_is_not_activity() -> None:
+    """Test that temperature drift and small mains changes do not count as activity."""
+    status = StatusSnapshot.from_payload(STATUS)
+
+    assert not _is_activity(status, status.replace(ac=status.get("ac") + 1.5))
+    assert not _is_activity(status, status.replace(temp_l=60.0))
+    assert _is_activity(status, status.replace(ac=status.get("ac") + 10))
+    assert _is_activity(status, status.replace(amp_pwr=False))
+    assert _is_activity(None, status)
+
+
+def test_capabilities_without_info_support_everything() -> None:
+    """Test that nothing is ruled out before the amp told what it has."""
+    capabilities = BramaCapabilities.from_info(None)
+
+    assert capabilities.supports(("settings", "htb"))
+    assert capabilities.supports(("status", "temp_l"))
+    assert capabilities.option_counts == {}
+
+
+def test_capabilities_from_info() -> None:
+    """Test that the settings and inputs the amp lists are followed."""
+    capabilities = BramaCapabilities.from_info(
+        InfoSnapshot.from_payload(
+            {INFO_FEATURES_KEY: ["vol", "src"], INFO_INPUTS_KEY: "3"}
+        )
+    )
+
+    assert capabilities.supports(("settings", "vol"))
+    assert not capabilities.supports(("settings", "htb"))
+    # Only settings are listed, the status is always there
+    assert capabilities.supports(("status", "temp_l"))
+    assert capabilities.option_counts == {"src": 3}
+    assert capabilities == BramaCapabilities.from_info(
+        InfoSnapshot.from_payload(
+            {INFO_FEATURES_KEY: ["src", "vol"], INFO_INPUTS_KEY: 3}
+        )
+    )
@@ -0,0 +1,181 @@
+"""Tests for the setup of brama_integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from homeassistant.const import STATE_UNKNOWN
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.brama_integration.const import (
+    CONF_MIN_POLL_INTERVAL,
+    CONF_REQUEST_TIMEOUT,
+    DOMAIN,
+    INFO_FEATURES_KEY,
+)
+
+from . import INFO, SETTINGS, STATUS, async_setup_replay, exchange, get_entity_id
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+@pytest.mark.usefixtures("stored_state")
+async def test_setup_skips_unsupported_entities(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that values the amp does not have get no entity, even a stale one."""
+    er.async_get(hass).async_get_or_create(
+        "switch",
+        DOMAIN,
+        f"{config_entry.entry_id}_{DOMAIN}_htb",
+        config_entry=config_entry,
+    )
+
+    await async_setup_replay(
+        hass,
+        config_entry,
+        exchange("status", STATUS),
+        exchange("settings", SETTINGS),
+        exchange("info", INFO),
+    )
+
+    assert get_entity_id(hass, config_entry, "switch", "htb") is None
+    mute = get_entity_id(hass, config_entry, "switch", "mute")
+    power = get_entity_id(hass, config_entry, "switch", "power")
+    assert hass.states.get(mute).state == "off"
+    assert hass.states.get(power).state == "on"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_first_setup_asks_for_info(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that a new amp is set up for what it has, without a reload."""
+    session = await async_setup_replay(
+        hass,
+        config_entry,
+        exchange("status", STATUS),
+        exchange("settings", SETTINGS),
+        exchange("info", INFO),
+    )
+
+    assert get_entity_id(hass, config_entry, "switch", "htb") is None
+    assert get_entity_id(hass, config_entry, "switch", "mute") is not None
+    # A reload would have refreshed the status once more
+    assert [request for request in session.requests if request[1] == "status"] == [
+        ("get", "status", None)
+    ]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+@pytest.mark.usefixtures("stored_state")
+async def test_changed_capabilities_reload(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test that live info with other capabilities is stored and set up for."""
+    info = {**INFO, INFO_FEATURES_KEY: sorted(SETTINGS)}
+    await async_setup_replay(
+        hass,
+        config_entry,
+        exchange("status", STATUS),
+        exchange("settings", SETTINGS),
+        exchange("info", info),
+    )
+
+    assert hass_storage[f"{DOMAIN}.{config_entry.entry_id}"]["data"]["info"] == info
+    assert config_entry.runtime_data.capabilities.supports(("settings", "htb"))
+    assert get_entity_id(hass, config_entry, "switch", "htb") is not None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+@pytest.mark.usefixtures("stored_state")
+async def test_missing_value_is_unknown(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that a switch whose value the amp does not report is not off."""
+    settings = {key: value for key, value in SETTINGS.items() if key != "muted"}
+    await async_setup_replay(
+        hass,
+        config_entry,
+        exchange("status", STATUS),
+        exchange("settings", settings),
+        exchange("info", INFO),
+    )
+
+    mute = get_entity_id(hass, config_entry, "switch", "mute")
+    assert hass.states.get(mute).state == STATE_UNKNOWN
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+@pytest.mark.usefixtures("stored_state")
+async def test_options_apply_without_reload(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that changed options are applied to the running entry."""
+    await async_setup_replay(
+        hass,
+        config_entry,
+        exchange("status", STATUS),
+        exchange("settings", SETTINGS),
+        exchange("info", INFO),
+    )
+    client = config_entry.runtime_data.client
+    coordinator = config_entry.runtime_data.coordinator
+
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={CONF_REQUEST_TIMEOUT: 20, CONF_MIN_POLL_INTERVAL: 5},
+    )
+    await hass.async_block_till_done()
+
+    assert config_entry.runtime_data.client is client
+    assert client.request_timeout == 20
+    assert coordinator.min_interval.total_seconds() == 5
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+@pytest.mark.usefixtures("stored_state")
+async def test_failed_write_is_rolled_back(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that a value the amp did not take is put back in the cached data."""
+    session = await async_setup_replay(
+        hass,
+        config_entry,
+        exchange("status", STATUS),
+        exchange("settings", SETTINGS),
+        exchange("info", INFO),
+        exchange("control", method="post", error="Connection reset"),
+    )
+    entity_id = get_entity_id(hass, config_entry, "switch", "mute")
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            "switch", "turn_on", {"entity_id": entity_id}, blocking=True
+        )
+
+    assert session.requests[-1] == (
+        "post",
+        "control",
+        {"settings": {"muted": True}},
+    )
+    assert hass.states.get(entity_id).state == "off"
+    assert config_entry.runtime_data.coordinator.data["settings"].get("muted") is False
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,130 @@
+"""Tests for the recording and replay of the API traffic of brama_integration."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from collections import deque
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.brama_integration.api import (
+    BramaIntegrationApiClientCommunicationError,
+)
+from custom_components.brama_integration.recording import (
+    TIMEOUT_ERROR,
+    BramaRecorder,
+    BramaRecording,
+    BramaReplay,
+)
+
+from . import IP_ADDRESS, SETTINGS, STARTED, STATUS, exchange
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from . import ReplayClientFactory
+
+
+async def test_client_traffic_is_recorded(replay_client: ReplayClientFactory) -> None:
+    """Test that every request of a client ends up in its recording."""
+    client, _ = replay_client(
+        exchange("status", STATUS),
+        exchange("settings", error=TIMEOUT_ERROR),
+        exchange("control", {}, method="post"),
+    )
+    client.recorder = BramaRecorder(IP_ADDRESS, STARTED)
+
+    await client.async_get_status()
+    with pytest.raises(BramaIntegrationApiClientCommunicationError):
+        await client.async_get_settings()
+    await client.async_set_volume(10)
+
+    status, settings, control = client.recorder.recording.exchanges
+    assert (status.method, status.endpoint, status.status) == ("get", "status", 200)
+    assert json.loads(status.body) == STATUS
+    assert (settings.status, settings.body, settings.error) == (
+        None,
+        None,
+        TIMEOUT_ERROR,
+    )
+    assert control.data == {"settings": {"vol": 10}}
+    assert control.offset >= settings.offset >= status.offset
+
+
+def test_recording_round_trip(tmp_path: Path) -> None:
+    """Test that a saved recording loads as it was, with repeated bodies shared."""
+    recording = BramaRecording(IP_ADDRESS, STARTED)
+    recording.exchanges.extend(
+        [
+            exchange("status", STATUS, duration=0.0123),
+            exchange("settings", SETTINGS),
+            exchange("status", STATUS),
+            exchange("control", {}, method="post"),
+            exchange("status", error="Connection reset"),
+            exchange("info", "", status=500),
+        ]
+    )
+    path = tmp_path / "brama_integration" / "recording.jsonl.gz"
+
+    recording.save(path)
+    loaded = BramaRecording.load(path)
+
+    # Timings are kept to the millisecond
+    assert loaded.exchanges[0].duration == 0.012
+    loaded.exchanges[0].duration = recording.exchanges[0].duration
+    assert loaded == recording
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file]
+    assert lines[0]["ip_address"] == IP_ADDRESS
+    # The third exchange repeats the body of the first
+    assert lines[3]["b"] == 0
+
+
+def test_recording_of_unknown_version(tmp_path: Path) -> None:
+    """Test that a recording of another version is refused."""
+    path = tmp_path / "recording.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.write(json.dumps({"version": 0}) + "\n")
+
+    with pytest.raises(ValueError, match="Unsupported recording version"):
+        BramaRecording.load(path)
+
+
+def test_replay_cycles_per_endpoint() -> None:
+    """Test that the exchanges of each endpoint are played back in a loop."""
+    first = exchange("status", STATUS, duration=0.5)
+    second = exchange("status", {**STATUS, "ac": 23100})
+    settings = exchange("settings", SETTINGS)
+    replay = BramaReplay(
+        BramaRecording(IP_ADDRESS, STARTED, deque([first, settings, second])), speed=10
+    )
+
+    assert replay.next_exchange("GET", "status") is first
+    assert replay.next_exchange("get", "status") is second
+    assert replay.next_exchange("get", "status") is first
+    assert replay.next_exchange("get", "settings") is settings
+    assert replay.next_exchange("get", "info").status == 404
+    assert replay.delay(first) == pytest.approx(0.05)
+
+
+async def test_replayed_failures_reach_the_client(
+    replay_client: ReplayClientFactory,
+) -> None:
+    """Test that the client sees replayed failures like the recorded ones."""
+    client, _ = replay_client(
+        exchange("status", error=TIMEOUT_ERROR),
+        exchange("settings", error="Connection reset"),
+    )
+
+    with pytest.raises(BramaIntegrationApiClientCommunicationError, match="Timeout"):
+        await client.async_get_status()
+    with pytest.raises(BramaIntegrationApiClientCommunicationError):
+        await client.async_get_settings()
+    # Endpoints missing from the recording answer with a 404
+    with pytest.raises(BramaIntegrationApiClientCommunicationError, match="404"):
+        await client.async_get_info()
+
+    assert client.metrics["status"].timeouts == 1
+    assert client.metrics["settings"].errors == 1
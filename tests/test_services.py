@@ -0,0 +1,50 @@
+"""Tests for the services of brama_integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.brama_integration.const import (
+    ATTR_NAME,
+    DOMAIN,
+    SERVICE_RESTORE,
+)
+
+from . import INFO, SETTINGS, STATUS, async_setup_replay, exchange
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+@pytest.mark.usefixtures("stored_state")
+async def test_restore_unknown_snapshot(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that restoring a snapshot that was never taken is refused."""
+    session = await async_setup_replay(
+        hass,
+        config_entry,
+        exchange("status", STATUS),
+        exchange("settings", SETTINGS),
+        exchange("info", INFO),
+    )
+
+    with pytest.raises(ServiceValidationError) as exc_info:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_RESTORE,
+            {ATTR_NAME: "evening"},
+            blocking=True,
+        )
+
+    assert exc_info.value.translation_domain == DOMAIN
+    assert exc_info.value.translation_key == "snapshot_not_found"
+    assert exc_info.value.translation_placeholders == {"name": "evening"}
+    assert not [request for request in session.requests if request[0] == "post"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)